@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+LLM을 호출하지 않고 번역 전 토큰·비용을 예측하고, 번역 후 단어사전 용어 준수 여부를 검사하는 명령줄 도구
+
+사용법:
+    python analyze.py estimate source_docs --models claude-opus-4-20250514,gpt-4o
+    python analyze.py check mt --glossary ./glossary/glossary.json
+    python analyze.py check mt --source source_docs --suffix _ko
+"""
+import argparse
+import sys
+from functools import partial
+from pathlib import Path
+from tools.utils import load_prompt_template, load_glossary
+from tools.analysis import OUTPUT_TOKEN_RATIO, estimate_translation, scan_glossary_compliance
+from tools.chunking import pack_chunks
+from tools.splitter import iter_markdown_file
+from tools.placeholders import CODE_BLOCKS, INLINE_CODE, URLS
+from tools.pipeline import build_chunk_prompts, supports_cache_control
+from batch_translate import find_source_files, source_path_for
+
+
+def format_cost(cost: float | None) -> str:
+    return "가격 정보 없음" if cost is None else f"${cost:,.4f}"
+
+
+def estimate(args):
+    _, source_files = find_source_files(args.source)
+    if not source_files:
+        sys.exit(f"분석할 파일을 찾을 수 없습니다: {args.source}")
+    base_prompt = load_prompt_template(args.prompt)
+    glossary_data = load_glossary(args.glossary)
+    cache_control = not args.no_prompt_cache and supports_cache_control(args.models[0])
+
+    totals = {"requests": 0, "input_tokens": 0, "output_tokens": 0, "cache_read_tokens": 0}
+    costs = dict.fromkeys(args.models, 0.0)
+    for source_file in source_files:
+        source_chunks = pack_chunks([chunk.text for chunk in iter_markdown_file(source_file)], args.max_chunk_tokens)
+        prompts, placeholders = build_chunk_prompts(
+            source_chunks, base_prompt, glossary_data, args.prune_glossary, args.protect,
+            cache_prefix=not args.no_prompt_cache,
+            cache_control=cache_control
+        )
+        result = estimate_translation(source_chunks, prompts, args.models, placeholders, output_ratio=args.output_ratio)
+        for key in totals:
+            totals[key] += result[key]
+        for model, cost in result["costs"].items():
+            costs[model] = None if cost is None or costs[model] is None else costs[model] + cost
+
+        print(f"{source_file}: 요청 {result['requests']}건, 입력 {result['input_tokens']:,} / 출력 {result['output_tokens']:,} 토큰")
+        if args.per_chunk:
+            for chunk in result["chunks"]:
+                chunk_costs = ", ".join(f"{model} {format_cost(cost)}" for model, cost in chunk["cost_usd"].items())
+                print(f"  문단 {chunk['index'] + 1}: 입력 {chunk['input_tokens']:,} / 출력 {chunk['output_tokens']:,} 토큰 ({chunk_costs})")
+
+    print(
+        f"\n합계: 파일 {len(source_files)}개, 요청 {totals['requests']}건, "
+        f"입력 {totals['input_tokens']:,} 토큰 (캐시 읽기 {totals['cache_read_tokens']:,}) / 출력 {totals['output_tokens']:,} 토큰"
+    )
+    for model, cost in costs.items():
+        print(f"  {model}: {format_cost(cost)}")
+    print("번역 메모리·재사용 문단은 빼지 않은 상한이며, 출력 토큰은 원문 토큰 × --output-ratio 로 추정합니다.")
+
+
+def check(args):
+    glossary_data = load_glossary(args.glossary)
+    source_for = None
+    if args.source:
+        source_for = partial(source_path_for, output_dir=Path(args.translation_dir), base_dir=Path(args.source), suffix=args.suffix)
+    documents = checked = compliant = 0
+    for target_path, result in scan_glossary_compliance(args.translation_dir, glossary_data, source_for):
+        if result is None:
+            print(f"{target_path}: 원본과 번역의 문단 수가 달라 건너뜁니다.")
+            continue
+        documents += 1
+        checked += result["checked"]
+        compliant += result["compliant"]
+        if not result["checked"]:
+            continue
+        print(f"{target_path}: 용어 {result['checked']}개 중 {result['compliant']}개 준수 ({result['compliance_rate']:.1%})")
+        for violation in result["violations"][:args.max_violations]:
+            print(f"  문단 {violation['index'] + 1}: \"{violation['source']}\" → {', '.join(violation['expected'])}")
+        hidden = len(result["violations"]) - args.max_violations
+        if hidden > 0:
+            print(f"  ... 외 {hidden}개")
+
+    if not documents:
+        sys.exit(f"원본 파일이나 원본 스냅샷(.source.md)이 있는 번역 파일을 찾을 수 없습니다: {args.translation_dir}")
+    rate = f"{compliant / checked:.1%}" if checked else "-"
+    print(f"\n합계: 번역 파일 {documents}개, 용어 {checked}개 중 {compliant}개 준수 ({rate})")
+    if args.min_rate is not None and checked and compliant / checked < args.min_rate:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="번역 전 토큰·비용 예측과 번역 후 단어사전 준수 검사")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    estimate_parser = subparsers.add_parser("estimate", help="번역할 문서의 토큰 수와 모델별 예상 비용을 계산합니다.")
+    estimate_parser.add_argument("source", help="분석할 문서 디렉토리 또는 glob 패턴 (예: 'docs/**/*.md')")
+    estimate_parser.add_argument(
+        "--models",
+        default="claude-opus-4-20250514",
+        type=lambda value: [model.strip() for model in value.split(",") if model.strip()],
+        help="쉼표로 구분한 비교할 모델 (첫 번째 모델 기준으로 캐시 지점을 표시합니다.)"
+    )
+    estimate_parser.add_argument("--prompt", default="./prompts/nmt.yaml", help="프롬프트 템플릿")
+    estimate_parser.add_argument("--glossary", default="./glossary/glossary.json", help="단어사전")
+    estimate_parser.add_argument("--max-chunk-tokens", type=int, default=0, help="문단 최대 토큰 수 (0이면 제목 기준으로만 나눕니다.)")
+    estimate_parser.add_argument("--prune-glossary", action="store_true", help="문단에 등장하는 단어사전 규칙만 프롬프트에 넣습니다.")
+    estimate_parser.add_argument(
+        "--protect",
+        default=CODE_BLOCKS,
+        type=lambda value: tuple(kind for kind in value.split(",") if kind),
+        help=f"LLM에 보내지 않고 그대로 유지할 요소 (쉼표로 구분: {CODE_BLOCKS},{INLINE_CODE},{URLS})"
+    )
+    estimate_parser.add_argument("--no-prompt-cache", action="store_true", help="프롬프트 접두부 캐싱을 쓰지 않는다고 가정합니다.")
+    estimate_parser.add_argument("--output-ratio", type=float, default=OUTPUT_TOKEN_RATIO, help="번역할 원문 토큰 대비 출력 토큰 비율")
+    estimate_parser.add_argument("--per-chunk", action="store_true", help="문단별 예측값도 출력합니다.")
+    estimate_parser.set_defaults(handler=estimate)
+
+    check_parser = subparsers.add_parser("check", help="번역 폴더 전체의 단어사전 용어 준수율을 검사합니다.")
+    check_parser.add_argument("translation_dir", help="번역 결과 폴더 (예: mt, mtpe)")
+    check_parser.add_argument("--source", default=None, help="원본 문서 디렉토리 (없거나 원본을 찾지 못하면 원본 스냅샷(.source.md)을 사용합니다.)")
+    check_parser.add_argument("--suffix", default="_ko", help="번역 파일 이름에 붙은 접미사 (--source와 함께 사용)")
+    check_parser.add_argument("--glossary", default="./glossary/glossary.json", help="단어사전")
+    check_parser.add_argument("--max-violations", type=int, default=10, help="파일마다 출력할 최대 위반 수")
+    check_parser.add_argument("--min-rate", type=float, default=None, help="전체 준수율이 이 값(0~1)보다 낮으면 종료 코드 1로 끝냅니다. (CI용)")
+    check_parser.set_defaults(handler=check)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+여러 마크다운 문서를 한 번에 번역하는 명령줄 도구 (cron, CI 등 화면 없이 실행)
+
+사용법:
+    python batch_translate.py source_docs --output-dir mt
+    python batch_translate.py "docs/**/*.md" --output-dir mt --max-concurrency 16
+    python batch_translate.py source_docs --langs ko,ja,zh --prompt "prompts/nmt_{lang}.yaml" --glossary "glossary/{lang}/glossary.json"
+    python batch_translate.py source_docs --fuzzy-tm mtpe --fuzzy-reuse-threshold 0.95
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from dotenv import load_dotenv
+from langchain_litellm import ChatLiteLLM
+from tools.utils import (
+    load_prompt_template,
+    load_glossary,
+    get_translation_memory,
+    get_api_key,
+    is_up_to_date
+)
+from tools.chunking import pack_chunks
+from tools.splitter import iter_markdown_file
+from tools.metrics import MetricsLog, summarize_metrics
+from tools.scheduler import AdaptiveLimiter
+from tools.placeholders import CODE_BLOCKS, INLINE_CODE, URLS
+from tools.journal import TranslationJournal, make_job_id
+from tools.pipeline import build_chunk_prompts, save_translation_result, supports_cache_control
+from tools.multilang import LanguageTarget, language_path, parse_languages, translate_languages
+from tools.fuzzy_memory import find_fuzzy_matches, load_fuzzy_memory, split_fuzzy_matches
+from tools.translation_memory import hash_file
+
+
+def find_source_files(source: str) -> tuple[Path, list[Path]]:
+    """디렉토리 또는 glob 패턴에서 번역할 마크다운 파일 목록과 기준 디렉토리를 찾습니다."""
+    if Path(source).is_dir():
+        base_dir = Path(source)
+        files = sorted(base_dir.rglob("*.md"))
+    else:
+        # glob 특수문자가 나오기 전까지의 경로를 기준 디렉토리로 사용합니다.
+        magic_index = min((source.find(c) for c in "*?[" if c in source), default=len(source))
+        base_dir = Path(os.path.dirname(source[:magic_index]))
+        files = sorted(Path(p) for p in glob.glob(source, recursive=True) if Path(p).is_file())
+    return base_dir, files
+
+
+def output_path_for(source_file: Path, base_dir: Path, output_dir: Path, suffix: str) -> Path:
+    """source_docs/models.md → mt/models_ko.md 처럼 출력 경로를 만듭니다."""
+    relative = source_file.relative_to(base_dir) if source_file.is_relative_to(base_dir) else Path(source_file.name)
+    return output_dir / relative.parent / f"{relative.stem}{suffix}{relative.suffix}"
+
+
+def source_path_for(output_file: Path, output_dir: Path, base_dir: Path, suffix: str) -> Path | None:
+    """output_path_for의 역변환: mt/models_ko.md → source_docs/models.md (접미사가 없는 파일이면 None)"""
+    relative = output_file.relative_to(output_dir) if output_file.is_relative_to(output_dir) else Path(output_file.name)
+    if not relative.stem.endswith(suffix):
+        return None
+    return base_dir / relative.parent / f"{relative.stem[:len(relative.stem) - len(suffix)]}{relative.suffix}"
+
+
+def translate_file(llm, source_file: Path, outputs: dict, args, resources: dict, tm, limiter, metrics_log) -> dict:
+    """파일 하나를 한 번만 나눈 뒤 모든 대상 언어로 동시에 번역해 저장하고, 언어별 통계를 반환합니다.
+
+    outputs는 {언어: 출력 경로}, resources는 {언어: (프롬프트 템플릿, 단어사전, 단어사전 버전, 퍼지 번역 메모리)}입니다.
+    (--langs가 없으면 언어는 None 하나입니다.) 실패한 문단이 있는 언어는 파일을 저장하지 않고,
+    완료된 문단은 작업 기록에 남겨 다음 실행에서 이어서 번역합니다.
+    """
+    source_chunks = pack_chunks([chunk.text for chunk in iter_markdown_file(source_file)], args.max_chunk_tokens)
+    cache_control = not args.no_prompt_cache and supports_cache_control(args.model)
+    targets = {}
+    for lang, output_file in outputs.items():
+        base_prompt, glossary_data, glossary_version, fuzzy_memory = resources[lang]
+        reused, references = {}, {}
+        if fuzzy_memory is not None:
+            matches = find_fuzzy_matches(fuzzy_memory, source_chunks, args.fuzzy_threshold)
+            reused, references = split_fuzzy_matches(matches, args.fuzzy_reuse_threshold)
+        prompts, placeholders = build_chunk_prompts(
+            source_chunks, base_prompt, glossary_data, args.prune_glossary, args.protect,
+            cache_prefix=not args.no_prompt_cache,
+            cache_control=cache_control,
+            references=references
+        )
+        targets[lang] = LanguageTarget(
+            prompts=prompts,
+            placeholders=placeholders,
+            reused=reused,
+            glossary_version=glossary_version,
+            journal=TranslationJournal(output_file, make_job_id(source_chunks, prompts, args.model)),
+            metrics_log=metrics_log.bind(document=str(source_file), lang=lang)
+        )
+
+    translated = {lang: [""] * len(source_chunks) for lang in outputs}
+    stats = {
+        lang: {
+            "chunks": len(target.prompts),
+            "cached": 0,
+            "chars": sum(len(source_chunks[i]) for i in target.prompts),
+            "errors": [],
+        }
+        for lang, target in targets.items()
+    }
+    events = translate_languages(
+        llm, source_chunks, targets,
+        model_name=args.model,
+        tm=tm,
+        max_workers=args.max_concurrency,
+        limiter=limiter,
+        max_retries=args.max_retries
+    )
+    for lang, event in events:
+        if not event.done:
+            continue
+        if event.error is not None:
+            stats[lang]["errors"].append(f"문단 {event.index + 1}: {event.error}")
+        else:
+            translated[lang][event.index] = event.text
+            stats[lang]["cached"] += event.cached
+
+    for lang, output_file in outputs.items():
+        if not stats[lang]["errors"]:
+            save_translation_result(output_file, source_chunks, translated[lang], targets[lang].journal)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="여러 마크다운 문서를 동시에 번역합니다.")
+    parser.add_argument("source", help="번역할 문서 디렉토리 또는 glob 패턴 (예: 'docs/**/*.md')")
+    parser.add_argument("--output-dir", default="./mt", help="번역 결과 저장 디렉토리")
+    parser.add_argument("--suffix", default="_ko", help="번역 파일 이름에 붙일 접미사")
+    parser.add_argument("--model", default="claude-opus-4-20250514", help="모델 이름")
+    parser.add_argument("--prompt", default="./prompts/nmt.yaml", help="프롬프트 템플릿 (--langs를 쓰면 {lang}이 언어 코드로 바뀝니다.)")
+    parser.add_argument("--glossary", default="./glossary/glossary.json", help="단어사전 (--langs를 쓰면 {lang}이 언어 코드로 바뀝니다.)")
+    parser.add_argument(
+        "--langs",
+        type=parse_languages,
+        default=[],
+        help="쉼표로 구분한 대상 언어 (예: ko,ja,zh). 원본을 한 번만 나눠 모든 언어로 동시에 번역하고 "
+             "--output-dir/<언어>/<이름>_<언어>.md 로 저장합니다. (예: --prompt 'prompts/nmt_{lang}.yaml')"
+    )
+    parser.add_argument("--max-concurrency", type=int, default=8, help="모든 파일을 통틀어 동시에 보내는 최대 LLM 요청 수 (사용량 제한에 걸리면 자동으로 줄어듭니다.)")
+    parser.add_argument("--max-retries", type=int, default=5, help="사용량 제한·일시적 오류가 난 문단을 다시 시도하는 최대 횟수")
+    parser.add_argument("--file-workers", type=int, default=4, help="동시에 처리하는 파일 수")
+    parser.add_argument("--max-chunk-tokens", type=int, default=0, help="문단 최대 토큰 수 (0이면 제목 기준으로만 나눕니다.)")
+    parser.add_argument("--prune-glossary", action="store_true", help="문단에 등장하는 단어사전 규칙만 프롬프트에 넣습니다.")
+    parser.add_argument(
+        "--protect",
+        default=CODE_BLOCKS,
+        type=lambda value: tuple(kind for kind in value.split(",") if kind),
+        help=f"LLM에 보내지 않고 그대로 유지할 요소 (쉼표로 구분: {CODE_BLOCKS},{INLINE_CODE},{URLS}, 빈 값이면 모두 번역)"
+    )
+    parser.add_argument("--no-prompt-cache", action="store_true", help="단어사전·지시문 접두부를 나눠 캐시하지 않고 하나의 메시지로 보냅니다.")
+    parser.add_argument(
+        "--fuzzy-tm",
+        default="",
+        help="비슷한 문단의 검수 번역을 참고하거나 재사용할 사후교정 폴더 (예: ./mtpe, --langs를 쓰면 {lang}이 언어 코드로 바뀝니다.)"
+    )
+    parser.add_argument("--fuzzy-threshold", type=float, default=0.6, help="참고 번역으로 넣을 최소 유사도 (원문 3-gram 자카드 유사도)")
+    parser.add_argument("--fuzzy-reuse-threshold", type=float, default=1.0, help="LLM 없이 검수 번역을 그대로 쓸 유사도 (1.0이면 공백만 다른 같은 문단만)")
+    parser.add_argument("--tm-path", default="./.cache/translation_memory.sqlite3", help="번역 메모리 경로")
+    parser.add_argument("--no-tm", action="store_true", help="번역 메모리를 사용하지 않습니다.")
+    parser.add_argument("--metrics-log", default="./logs/metrics.jsonl", help="문단별 성능 지표를 기록할 JSONL 경로")
+    parser.add_argument("--force", action="store_true", help="최신 번역 파일이 있어도 다시 번역합니다.")
+    args = parser.parse_args()
+
+    load_dotenv()
+    base_dir, source_files = find_source_files(args.source)
+    if not source_files:
+        sys.exit(f"번역할 파일을 찾을 수 없습니다: {args.source}")
+
+    languages = args.langs or [None]
+    paths = {
+        lang: (language_path(args.prompt, lang), language_path(args.glossary, lang)) if lang else (args.prompt, args.glossary)
+        for lang in languages
+    }
+    jobs = {}
+    skipped = 0
+    for source_file in source_files:
+        for lang in languages:
+            if lang:
+                output_file = output_path_for(source_file, base_dir, Path(args.output_dir) / lang, f"_{lang}")
+            else:
+                output_file = output_path_for(source_file, base_dir, Path(args.output_dir), args.suffix)
+            dependencies = [source_file] + [Path(path) for path in paths[lang]]
+            if not args.force and is_up_to_date(output_file, dependencies):
+                skipped += 1
+                continue
+            jobs.setdefault(source_file, {})[lang] = output_file
+
+    outputs_total = sum(len(outputs) for outputs in jobs.values())
+    print(f"번역 파일 {len(source_files) * len(languages)}개 중 {outputs_total}개를 번역합니다. (최신 상태 {skipped}개 건너뜀)")
+
+    llm = ChatLiteLLM(model=args.model, temperature=0.1, api_key=get_api_key(args.model) or None)
+    resources = {}
+    for lang, (prompt_path, glossary_path) in paths.items():
+        glossary_data = load_glossary(glossary_path)
+        fuzzy_memory = None
+        if args.fuzzy_tm:
+            fuzzy_memory = load_fuzzy_memory(language_path(args.fuzzy_tm, lang) if lang else args.fuzzy_tm)
+            print(f"검수 번역 {len(fuzzy_memory)}개 문단을 참고합니다." + (f" ({lang})" if lang else ""))
+        resources[lang] = (load_prompt_template(prompt_path), glossary_data, hash_file(glossary_path), fuzzy_memory)
+    tm = None if args.no_tm else get_translation_memory(args.tm_path, 512 * 1024 * 1024)
+    limiter = AdaptiveLimiter(args.max_concurrency)
+    metrics_log = MetricsLog(
+        args.metrics_log or None,
+        model=args.model,
+        glossary_size=len(resources[languages[0]][1]),
+        max_concurrency=args.max_concurrency
+    )
+
+    totals = {"files": 0, "failed": 0, "chunks": 0, "cached": 0, "chars": 0}
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, args.file_workers)) as executor:
+        futures = {
+            executor.submit(
+                translate_file, llm, source_file, outputs, args, resources, tm, limiter, metrics_log
+            ): (source_file, outputs)
+            for source_file, outputs in jobs.items()
+        }
+        for future in as_completed(futures):
+            source_file, outputs = futures[future]
+            try:
+                file_stats = future.result()
+            except Exception as e:
+                file_stats = {lang: {"chunks": 0, "cached": 0, "chars": 0, "errors": [str(e)]} for lang in outputs}
+
+            for lang, stats in file_stats.items():
+                output_file = outputs[lang]
+                if stats["errors"]:
+                    totals["failed"] += 1
+                    print(f"❌ {source_file} → {output_file}: 실패한 문단 {len(stats['errors'])}개", file=sys.stderr)
+                    for error in stats["errors"]:
+                        print(f"   - {error}", file=sys.stderr)
+                else:
+                    totals["files"] += 1
+                    print(f"✅ {source_file} → {output_file} (문단 {stats['chunks']}개, 번역 메모리 {stats['cached']}개)")
+                for key in ("chunks", "cached", "chars"):
+                    totals[key] += stats[key]
+
+    elapsed = time.perf_counter() - start
+    print()
+    print(f"완료: 파일 {totals['files']}개 저장, {totals['failed']}개 실패, {skipped}개 건너뜀")
+    print(f"문단 {totals['chunks']}개 (번역 메모리 {totals['cached']}개), 원문 {totals['chars']:,}자, {elapsed:.1f}초")
+    if elapsed > 0:
+        print(f"처리량: {totals['chunks'] / elapsed:.2f} 문단/초, {totals['chars'] / elapsed:,.0f} 자/초")
+    if metrics_log.records:
+        summary = summarize_metrics(metrics_log.records)
+        cost = f"${summary['cost_usd']:.4f}" if summary["cost_usd"] is not None else "알 수 없음"
+        ttft = f"{summary['avg_ttft_s']:.2f}초" if summary["avg_ttft_s"] is not None else "-"
+        print(
+            f"LLM 요청 {summary['requests']}건 (오류 {summary['errors']}, 재시도 {summary['retries']}, "
+            f"사용량 제한 {summary['throttled']}), 평균 첫 토큰 {ttft}, "
+            f"입력 {summary['input_tokens']:,} / 출력 {summary['output_tokens']:,} 토큰, 예상 비용 {cost}"
+        )
+        if summary["cache_hit_rate"] is not None:
+            print(
+                f"프롬프트 캐시: 적중률 {summary['cache_hit_rate'] * 100:.0f}% "
+                f"(읽기 {summary['cache_read_tokens']:,} / 쓰기 {summary['cache_creation_tokens']:,} 토큰, "
+                f"적중 요청 {summary['cache_hit_requests']}건)"
+            )
+    sys.exit(1 if totals["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
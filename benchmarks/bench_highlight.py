@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+highlight_terms 마이크로벤치마크: 기존 정규식 방식과 트라이 매처를 비교합니다.
+
+사용법:
+    python benchmarks/bench_highlight.py --terms 5000 --repeat 20
+"""
+import argparse
+import random
+import re
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.matcher import TermMatcher, get_term_matcher  # noqa: E402
+
+
+def legacy_highlight_terms(text: str, terms: list) -> str:
+    """이전 버전의 highlight_terms (호출마다 정규식을 새로 만듭니다)"""
+    if not terms:
+        return text
+    sorted_terms = sorted(terms, key=len, reverse=True)
+    term_pattern = '|'.join(re.escape(term) for term in sorted_terms)
+    pattern = re.compile(
+        rf"(```.*?```|`.*?`|{term_pattern})",
+        re.DOTALL | re.IGNORECASE
+    )
+
+    def replace_match(match):
+        matched_text = match.group(0)
+        if matched_text.startswith('`'):
+            return matched_text
+        return f'<span style="color: blue; font-weight: bold;">{matched_text}</span>'
+
+    return pattern.sub(replace_match, text)
+
+
+def make_terms(text: str, count: int, seed: int = 0) -> list[str]:
+    """문서에 실제로 등장하는 단어와 임의의 단어를 섞어 용어 목록을 만듭니다."""
+    rng = random.Random(seed)
+    words = sorted(set(re.findall(r"[A-Za-z][A-Za-z-]{3,}", text)))
+    terms = rng.sample(words, min(len(words), count // 10))
+    while len(terms) < count:
+        length = rng.randint(4, 14)
+        terms.append("".join(rng.choice(string.ascii_lowercase) for _ in range(length)))
+    return terms
+
+
+def timeit(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--source", default="source_docs/models.md")
+    parser.add_argument("--terms", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    text = Path(args.source).read_text(encoding='utf-8')
+    terms = make_terms(text, args.terms)
+
+    if legacy_highlight_terms(text, terms) != TermMatcher(terms).highlight(text):
+        sys.exit("❌ 정규식 방식과 트라이 매처의 결과가 다릅니다.")
+
+    get_term_matcher(terms)  # 캐시 워밍업
+    legacy = timeit(lambda: legacy_highlight_terms(text, terms), args.repeat)
+    build = timeit(lambda: TermMatcher(terms), max(1, args.repeat // 4))
+    cached = timeit(lambda: get_term_matcher(terms).highlight(text), args.repeat)
+
+    print(f"문서 {len(text):,}자, 용어 {len(terms):,}개")
+    print(f"  정규식 (호출마다 컴파일) : {legacy * 1000:8.2f} ms/호출")
+    print(f"  트라이 매처 생성 (1회)   : {build * 1000:8.2f} ms")
+    print(f"  트라이 매처 (캐시 사용)  : {cached * 1000:8.2f} ms/호출")
+    print(f"  속도 향상               : {legacy / cached:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
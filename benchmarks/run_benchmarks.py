@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+API 비용 없이 번역 파이프라인의 성능을 측정하는 오프라인 벤치마크
+
+합성 마크다운 문서와 단어사전을 만들어 분할·프롬프트 생성·용어 강조 시간을 재고,
+가짜 채팅 모델(tools/fake_llm.py)로 translator.py와 같은 번역 파이프라인을 실행해
+문서 처리량, 첫 문단 완료 시간, 단계별(분할·프롬프트 생성·번역) 최대 메모리 사용량을 보고합니다.
+
+사용법:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --sections 300 --glossary-size 10000 --save baseline.json
+    python benchmarks/run_benchmarks.py --baseline baseline.json --tolerance 0.2
+"""
+import argparse
+import json
+import random
+import string
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.display import highlight_terms  # noqa: E402
+from tools.fake_llm import FakeChatModel  # noqa: E402
+from tools.metrics import MetricsLog, summarize_metrics  # noqa: E402
+from tools.pipeline import build_chunk_prompts, translate_document  # noqa: E402
+from tools.scheduler import AdaptiveLimiter  # noqa: E402
+from tools.tokens import prompt_to_text  # noqa: E402
+from tools.utils import get_glossary_terms, prepare_final_prompt, split_markdown_by_headings  # noqa: E402
+
+BASE_PROMPT = """다음 영어 기술 문서를 한국어로 번역하세요.
+
+단어사전:
+{glossary_instructions}
+
+<source>
+{source}
+</source>"""
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 10)))
+
+
+def make_glossary(size: int, seed: int = 0) -> list:
+    """합성 단어사전을 만듭니다."""
+    rng = random.Random(seed)
+    entries = {}
+    while len(entries) < size:
+        source = " ".join(_word(rng) for _ in range(rng.randint(1, 3)))
+        entries[source] = {"source": source, "target": [f"용어{len(entries)}"]}
+    return list(entries.values())
+
+
+def make_markdown(sections: int, glossary: list, seed: int = 0) -> str:
+    """제목·단락·목록·코드 블록이 섞인 합성 마크다운 문서를 만듭니다."""
+    rng = random.Random(seed)
+    terms = [entry["source"] for entry in glossary] or ["model"]
+    lines = []
+
+    def sentence():
+        words = [_word(rng) for _ in range(rng.randint(8, 20))]
+        words.insert(rng.randrange(len(words)), rng.choice(terms))
+        return " ".join(words).capitalize() + "."
+
+    for s in range(sections):
+        lines.append(f"{'#' * rng.randint(1, 3)} Section {s} {rng.choice(terms)}")
+        lines.append("")
+        for _ in range(rng.randint(1, 4)):
+            lines.append(" ".join(sentence() for _ in range(rng.randint(2, 5))))
+            lines.append("")
+        if rng.random() < 0.5:
+            lines.extend(f"- {sentence()}" for _ in range(rng.randint(2, 5)))
+            lines.append("")
+        if rng.random() < 0.4:
+            lines.append("```py")
+            lines.append("# comment that looks like a heading")
+            lines.extend(f"{_word(rng)} = {_word(rng)}(`{_word(rng)}`)" for _ in range(rng.randint(2, 8)))
+            lines.append("```")
+            lines.append("")
+    return "\n".join(lines)
+
+
+def extract_source(prompt: str) -> str:
+    """가짜 모델이 '번역'으로 돌려줄 원문 부분을 프롬프트에서 꺼냅니다."""
+    start = prompt.rfind("<source>\n")
+    end = prompt.rfind("\n</source>")
+    # 프롬프트 캐싱을 쓰면 마지막 메시지가 원문부터 시작합니다.
+    start = start + len("<source>\n") if start != -1 else 0
+    return prompt[start:end] if end != -1 else prompt[start:]
+
+
+def timed(func, repeat: int = 1):
+    """func를 repeat번 실행한 평균 시간(초)과 마지막 결과를 반환합니다."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def traced_peak_mb(func):
+    """func를 한 번 실행하는 동안의 최대 메모리 할당량(MB)과 결과를 반환합니다. (시간 측정과 따로 실행)"""
+    tracemalloc.start()
+    try:
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / (1024 * 1024), result
+
+
+def run(args) -> dict:
+    glossary = make_glossary(args.glossary_size, args.seed)
+    markdown = make_markdown(args.sections, glossary, args.seed)
+    source_terms, target_terms = get_glossary_terms(glossary)
+    results = {"document_chars": len(markdown), "glossary_size": len(glossary)}
+
+    results["split_s"], chunks = timed(lambda: split_markdown_by_headings(markdown), args.repeat)
+    results["split_peak_mb"], _ = traced_peak_mb(lambda: split_markdown_by_headings(markdown))
+    results["chunks"] = len(chunks)
+    results["prepare_prompt_s"], _ = timed(lambda: prepare_final_prompt(BASE_PROMPT, glossary), args.repeat)
+
+    def build_prompts():
+        return build_chunk_prompts(
+            chunks, BASE_PROMPT, glossary, args.prune_glossary, args.protect,
+            cache_prefix=args.prompt_cache, cache_control=args.prompt_cache
+        )
+
+    results["build_prompts_s"], (prompts, placeholders) = timed(build_prompts)
+    results["build_prompts_peak_mb"], _ = traced_peak_mb(build_prompts)
+    results["prompt_chars"] = sum(len(prompt_to_text(p)) for p in prompts.values())
+    # 첫 호출은 매처 생성 비용을 포함하고, 이후 호출은 캐시된 매처를 사용합니다.
+    results["highlight_first_s"], _ = timed(lambda: [highlight_terms(c, source_terms) for c in chunks])
+    results["highlight_s"], _ = timed(lambda: [highlight_terms(c, source_terms) for c in chunks], args.repeat)
+    results["highlight_target_s"], _ = timed(lambda: [highlight_terms(c, target_terms) for c in chunks])
+
+    llm = FakeChatModel(
+        ttft=args.ttft,
+        tokens_per_second=args.tokens_per_second,
+        response_fn=extract_source,
+        capacity=args.capacity,
+        error_rate=args.error_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+        prompt_cache=args.prompt_cache
+    )
+    metrics_log = MetricsLog(None)
+    limiter = AdaptiveLimiter(args.workers)
+    tracemalloc.start()
+    start = time.perf_counter()
+    first_chunk_s = None
+    output_chars = 0
+    events = translate_document(
+        llm, chunks, prompts,
+        max_workers=args.workers,
+        limiter=limiter,
+        max_retries=args.max_retries,
+        metrics_log=metrics_log,
+        placeholders=placeholders
+    )
+    for event in events:
+        if event.done:
+            if event.error is not None:
+                raise event.error
+            if first_chunk_s is None and event.index in prompts:
+                first_chunk_s = time.perf_counter() - start
+            output_chars += len(event.text)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    results["end_to_end_s"] = elapsed
+    results["time_to_first_chunk_s"] = first_chunk_s or 0.0
+    results["chunks_per_s"] = len(prompts) / elapsed if elapsed else 0.0
+    results["output_chars_per_s"] = output_chars / elapsed if elapsed else 0.0
+    results["translate_peak_mb"] = peak / (1024 * 1024)
+    results["peak_memory_mb"] = max(
+        results["split_peak_mb"], results["build_prompts_peak_mb"], results["translate_peak_mb"]
+    )
+    results["llm_requests"] = llm.requests
+    results["rate_limited"] = llm.rate_limited
+    results["final_concurrency"] = limiter.limit
+    summary = summarize_metrics(metrics_log.records)
+    results["input_tokens"] = summary["input_tokens"]
+    results["prompt_cache_hit_rate"] = summary["cache_hit_rate"] or 0.0
+    return results
+
+
+# 값이 커질수록 나빠지는 지표 (기준선 비교에 사용)
+LOWER_IS_BETTER = [
+    "split_s", "prepare_prompt_s", "build_prompts_s", "highlight_first_s", "highlight_s",
+    "highlight_target_s", "end_to_end_s", "time_to_first_chunk_s", "split_peak_mb", "build_prompts_peak_mb",
+    "translate_peak_mb", "peak_memory_mb",
+]
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """기준선보다 tolerance 비율 이상 나빠진 지표를 찾습니다."""
+    regressions = []
+    for key in LOWER_IS_BETTER:
+        old, new = baseline.get(key), results.get(key)
+        if old and new is not None and new > old * (1 + tolerance):
+            regressions.append(f"{key}: {old:.4f} → {new:.4f} (+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="번역 파이프라인 오프라인 벤치마크")
+    parser.add_argument("--sections", type=int, default=150, help="합성 문서의 제목(섹션) 수")
+    parser.add_argument("--glossary-size", type=int, default=5000, help="합성 단어사전 항목 수")
+    parser.add_argument("--workers", type=int, default=8, help="동시 번역 문단 수")
+    parser.add_argument("--ttft", type=float, default=0.2, help="가짜 모델의 첫 토큰 지연(초)")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0, help="가짜 모델의 토큰 생성 속도")
+    parser.add_argument("--capacity", type=int, help="가짜 제공자가 동시에 처리하는 요청 수 (넘으면 429)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="무작위 429 응답 비율")
+    parser.add_argument("--retry-after", type=float, help="429 응답의 Retry-After(초)")
+    parser.add_argument("--max-retries", type=int, default=8, help="문단별 최대 재시도 횟수")
+    parser.add_argument("--prune-glossary", action="store_true", help="문단별 단어사전 필터링 사용")
+    parser.add_argument(
+        "--protect",
+        default="code",
+        type=lambda value: tuple(kind for kind in value.split(",") if kind),
+        help="LLM에 보내지 않을 요소 (code,inline,url 중 쉼표로 구분)"
+    )
+    parser.add_argument("--prompt-cache", action="store_true", help="접두부를 나눈 메시지 프롬프트와 가짜 프롬프트 캐시 사용")
+    parser.add_argument("--repeat", type=int, default=5, help="CPU 단계 반복 측정 횟수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="결과를 JSON으로 저장할 경로 (기준선으로 사용)")
+    parser.add_argument("--baseline", help="비교할 기준선 JSON 경로")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용하는 성능 저하 비율")
+    args = parser.parse_args()
+
+    results = run(args)
+    width = max(len(key) for key in results)
+    for key, value in results.items():
+        print(f"{key:<{width}}  {value:,.4f}" if isinstance(value, float) else f"{key:<{width}}  {value:,}")
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2), encoding='utf-8')
+        print(f"\n결과를 저장했습니다: {args.save}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\n❌ 성능 저하가 감지되었습니다:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print("\n✅ 기준선 대비 성능 저하가 없습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,17 @@
-import csv
-import json
+import sys
+from pathlib import Path
 
-data = []
+# 저장소 루트의 tools 패키지를 사용합니다.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-with open('glossary.csv', 'r', encoding='utf-8', newline='') as f:
-    reader = csv.reader(f)  # 쉼표 구분자이므로 delimiter 생략
-    rows = list(reader)
+from tools.glossary import load_compiled_glossary, read_glossary_csv, write_glossary_json  # noqa: E402
 
-# 첫 행 제거 ([CLS] classification ...)
-for row in rows[1:]:
-    if not row:  # 빈 줄 방지
-        continue
-    source = row[0].strip()
-    targets = [cell.strip() for cell in row[1:] if cell.strip() != ""]
-    data.append({
-        "source": source,
-        "target": targets
-    })
+# 첫 행([CLS] classification ...)은 제외하고 읽습니다.
+data = read_glossary_csv('glossary.csv')
 
 # JSON 파일로 저장
-with open('glossary.json', 'w', encoding='utf-8') as f:
-    json.dump(data, f, ensure_ascii=False, indent=2)
+write_glossary_json(data, 'glossary.json')
+
+# 번역기가 바로 쓸 수 있도록 색인을 미리 컴파일합니다. (glossary.compiled.json)
+load_compiled_glossary('glossary.json')
+print(f"✅ 단어사전 {len(data)}개 항목을 glossary.json 으로 변환하고 컴파일했습니다.")
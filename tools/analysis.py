@@ -0,0 +1,118 @@
+"""
+번역 전 토큰·비용 예측과 번역 후 단어사전 용어 준수 검사 (LLM을 호출하지 않는 오프라인 분석)
+"""
+from tools.documents import iter_translated_documents
+from tools.glossary import find_glossary_entries, get_glossary_terms, normalize_term
+from tools.matcher import get_term_matcher
+from tools.metrics import estimate_cost
+from tools.tokens import estimate_tokens, prompt_to_text
+
+# 출력 토큰 수 / 번역할 원문 토큰 수 (영어 → 한국어 기준 근사치)
+OUTPUT_TOKEN_RATIO = 1.5
+
+
+def _translated_tokens(chunk: str, mapping: dict) -> int:
+    """자리표시자로 바꿔 보내는 부분을 빼고 번역할 원문의 토큰 수를 추정합니다."""
+    tokens = estimate_tokens(chunk)
+    for placeholder, original in mapping.items():
+        tokens += estimate_tokens(placeholder) - estimate_tokens(original)
+    return max(tokens, 0)
+
+
+def estimate_translation(source_chunks: list[str], prompts: dict, models, placeholders: dict | None = None,
+                         skip=(), output_ratio: float = OUTPUT_TOKEN_RATIO) -> dict:
+    """LLM을 호출하지 않고 문단별·전체 입력/출력 토큰 수와 모델별 예상 비용(USD)을 계산합니다.
+
+    prompts와 placeholders는 build_chunk_prompts의 반환값이며, 빈 문단과 skip(재사용할 문단 등)은 제외합니다.
+    출력 토큰은 번역할 원문 토큰 수에 output_ratio를 곱한 근사치입니다. 나눈 프롬프트는 같은 접두부의 첫 요청이
+    캐시에 쓰고 이후 요청은 캐시에서 읽는다고 가정하며, 번역 메모리에 있는 문단만큼 실제 비용은 더 적습니다.
+    가격을 모르는 모델의 비용은 None입니다.
+    """
+    placeholders = placeholders or {}
+    chunks = []
+    prefix_tokens = {}  # 접두부 → 토큰 수 (모든 문단이 같은 접두부를 쓰므로 한 번만 셉니다.)
+    for i, prompt in sorted(prompts.items()):
+        if i in skip:
+            continue
+        cache_read = cache_creation = 0
+        if isinstance(prompt, str):
+            input_tokens = estimate_tokens(prompt)
+        else:
+            prefix = prompt_to_text(prompt[:-1])  # 마지막 사용자 메시지 앞의 접두부
+            if prefix in prefix_tokens:
+                cache_read = prefix_tokens[prefix]
+            else:
+                cache_creation = prefix_tokens[prefix] = estimate_tokens(prefix)
+            input_tokens = prefix_tokens[prefix] + estimate_tokens(prompt_to_text(prompt[-1:]))
+        chunks.append({
+            "index": i,
+            "input_tokens": input_tokens,
+            "output_tokens": round(_translated_tokens(source_chunks[i], placeholders.get(i, {})) * output_ratio),
+            "cache_read_tokens": cache_read,
+            "cache_creation_tokens": cache_creation,
+        })
+
+    costs = {}
+    for model in models:
+        total = 0.0
+        for chunk in chunks:
+            cost = estimate_cost(
+                model, chunk["input_tokens"], chunk["output_tokens"],
+                chunk["cache_read_tokens"], chunk["cache_creation_tokens"]
+            )
+            chunk.setdefault("cost_usd", {})[model] = cost
+            if total is not None:
+                total = None if cost is None else total + cost
+        costs[model] = total
+    return {
+        "requests": len(chunks),
+        "input_tokens": sum(chunk["input_tokens"] for chunk in chunks),
+        "output_tokens": sum(chunk["output_tokens"] for chunk in chunks),
+        "cache_read_tokens": sum(chunk["cache_read_tokens"] for chunk in chunks),
+        "costs": costs,
+        "chunks": chunks,
+    }
+
+
+def check_glossary_compliance(source_chunks: list[str], target_chunks: list[str], glossary_data: list) -> dict:
+    """원문 문단에 나온 단어사전 용어가 같은 번역 문단에서 지정한 번역어로 쓰였는지 검사합니다.
+
+    문단마다 원문과 번역을 한 번씩만 훑습니다. 원문 용어는 문단별 단어사전 필터링과 같은 기준(find_glossary_entries)으로 찾으며,
+    번역어는 번역 문단 안에 부분 문자열로 나오면('모델을'의 '모델' 등) 지킨 것으로 봅니다. 코드는 검사하지 않습니다.
+    """
+    target_matcher = get_term_matcher(get_glossary_terms(glossary_data)[1])
+    expected = [{normalize_term(term) for term in entry["target"]} for entry in glossary_data]
+    checked = compliant = 0
+    violations = []
+    for i, (source, target) in enumerate(zip(source_chunks, target_chunks)):
+        entries = find_glossary_entries(source, glossary_data, skip_code=True)
+        if not entries:
+            continue
+        used = {normalize_term(term) for term in target_matcher.find_values(target)}
+        for entry_id in entries:
+            checked += 1
+            if expected[entry_id] & used:
+                compliant += 1
+            else:
+                entry = glossary_data[entry_id]
+                violations.append({"index": i, "source": entry["source"], "expected": entry["target"]})
+    return {
+        "chunks": len(source_chunks),
+        "checked": checked,
+        "compliant": compliant,
+        "compliance_rate": compliant / checked if checked else None,
+        "violations": violations,
+    }
+
+
+def scan_glossary_compliance(translation_dir: str, glossary_data: list, source_for=None):
+    """번역 폴더(mt/, mtpe/ 등)의 번역 파일마다 (번역 경로, 검사 결과)를 생성합니다.
+
+    원본은 source_for(번역 경로) 또는 원본 스냅샷(.source.md)에서 찾으며(iter_translated_documents 참고),
+    원본과 번역의 문단 수가 다르면 결과는 None입니다.
+    """
+    for target_path, source_chunks, target_chunks in iter_translated_documents(translation_dir, source_for):
+        if len(source_chunks) != len(target_chunks):
+            yield target_path, None
+        else:
+            yield target_path, check_glossary_compliance(source_chunks, target_chunks, glossary_data)
@@ -0,0 +1,146 @@
+"""
+토큰 예산에 맞춰 문단을 합치거나 나누고, 그 경계를 기록하는 도구
+"""
+import json
+import re
+from pathlib import Path
+from typing import Iterable
+from tools.splitter import fence_state
+from tools.tokens import estimate_tokens
+
+_LIST_ITEM = re.compile(r"^\s{0,3}(?:[-*+]|\d{1,9}[.)])\s")
+
+
+def _split_blocks(chunk: str) -> list[str]:
+    """문단을 빈 줄 또는 목록 항목 경계에서 블록으로 나눕니다. 코드 블록 내부는 나누지 않습니다."""
+    blocks = []
+    current = []
+    open_fence = None
+    for line in chunk.split("\n"):
+        next_fence = fence_state(open_fence, line)
+        if open_fence is None and current:
+            after_blank = current[-1].strip() == "" and line.strip() != ""
+            opens_fence = next_fence is not None and current[-1].strip()
+            if after_blank or _LIST_ITEM.match(line) or opens_fence:
+                blocks.append("\n".join(current))
+                current = []
+        open_fence = next_fence
+        current.append(line)
+    if current:
+        blocks.append("\n".join(current))
+    return blocks
+
+
+def _merge(pieces: list[str], max_tokens: int) -> list[str]:
+    """인접한 조각을 max_tokens를 넘지 않는 범위에서 이어 붙입니다."""
+    merged = []
+    current = []
+    current_tokens = 0
+    for piece in pieces:
+        tokens = estimate_tokens(piece)
+        if current and current_tokens + tokens > max_tokens:
+            merged.append("\n".join(current))
+            current = []
+            current_tokens = 0
+        current.append(piece)
+        current_tokens += tokens
+    if current:
+        merged.append("\n".join(current))
+    return merged
+
+
+def pack_chunks(chunks: list[str], max_tokens: int) -> list[str]:
+    """제목 단위 문단을 토큰 예산(max_tokens)에 맞게 다시 묶습니다.
+
+    예산을 넘는 문단은 문단(빈 줄)·목록 항목 경계에서 나누고, 작은 문단은 이웃 문단과 합칩니다.
+    코드 블록은 절대 나누지 않으므로 코드 블록 하나가 예산보다 크면 그대로 한 조각이 됩니다.
+    결과를 "\\n"으로 이어 붙이면 원래 문단을 "\\n"으로 이어 붙인 것과 같습니다.
+    max_tokens가 0 이하이면 문단을 그대로 반환합니다.
+    """
+    if max_tokens <= 0:
+        return list(chunks)
+
+    pieces = []
+    for chunk in chunks:
+        if estimate_tokens(chunk) > max_tokens:
+            pieces.extend(_merge(_split_blocks(chunk), max_tokens))
+        else:
+            pieces.append(chunk)
+    return _merge(pieces, max_tokens)
+
+
+def chunk_layout_path(target_path: str) -> Path:
+    """번역 파일의 문단 경계 기록 경로를 반환합니다. (예: mt/models_ko.chunks.json)"""
+    path = Path(target_path)
+    return path.with_name(f"{path.stem}.chunks.json")
+
+
+def _line_counts(chunks: list[str]) -> list[int]:
+    return [len(chunk.split("\n")) for chunk in chunks]
+
+
+def save_chunk_layout(target_path: str, source_chunks: list[str], target_chunks: list[str],
+                      reviewed: list[bool] | None = None):
+    """원본/번역 문단이 각각 몇 줄로 이루어졌는지 기록해, 나중에 같은 경계로 다시 나눌 수 있게 합니다.
+
+    reviewed(문단별 검수 여부)를 넘기면 함께 기록합니다. 퍼지 번역 메모리는 검수된 문단만 사용합니다.
+    """
+    layout_path = chunk_layout_path(target_path)
+    layout_path.parent.mkdir(parents=True, exist_ok=True)
+    layout = {"source": _line_counts(source_chunks), "target": _line_counts(target_chunks)}
+    if reviewed is not None:
+        layout["reviewed"] = [bool(flag) for flag in reviewed]
+    with open(layout_path, 'w', encoding='utf-8') as f:
+        json.dump(layout, f)
+
+
+def load_chunk_layout(target_path: str) -> dict | None:
+    """기록된 문단 경계를 읽습니다. 없으면 None을 반환합니다."""
+    layout_path = chunk_layout_path(target_path)
+    if not layout_path.exists():
+        return None
+    with open(layout_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _group_by_line_counts(lines: Iterable[str], line_counts: list[int]) -> list[str] | None:
+    if not line_counts:
+        return None
+    chunks = []
+    current = []
+    counts = iter(line_counts)
+    count = next(counts)
+    for line in lines:
+        current.append(line)
+        if count is not None and len(current) >= count:
+            chunks.append("\n".join(current))
+            current = []
+            count = next(counts, None)
+    if count is not None:
+        return None
+    if current:
+        chunks[-1] = "\n".join([chunks[-1]] + current)
+    return chunks
+
+
+def split_by_line_counts(content: str, line_counts: list[int]) -> list[str] | None:
+    """기록된 줄 수대로 내용을 나눕니다. 줄 수가 모자라면(파일이 바뀐 경우) None을 반환합니다.
+
+    파일 끝에 추가된 줄바꿈 등 남는 줄은 마지막 문단에 붙입니다.
+    """
+    return _group_by_line_counts(content.split("\n"), line_counts)
+
+
+def _iter_file_lines(path):
+    """파일을 한 줄씩 읽어 줄바꿈을 뺀 줄을 생성합니다. (파일 내용.split("\\n")과 같은 결과)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        line = ""
+        for line in f:
+            yield line[:-1] if line.endswith("\n") else line
+        if not line or line.endswith("\n"):
+            yield ""
+
+
+def read_by_line_counts(path, line_counts: list[int]) -> list[str] | None:
+    """파일 전체를 한 번에 읽지 않고 한 줄씩 읽으며 split_by_line_counts와 같이 나눕니다."""
+    return _group_by_line_counts(_iter_file_lines(path), line_counts)
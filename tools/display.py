@@ -1,107 +1,257 @@
-import re
+import math
+from functools import lru_cache
 from pathlib import Path
 import streamlit as st
+from tools.incremental import save_source_snapshot
+from tools.chunking import save_chunk_layout
+from tools.matcher import TermMatcher, get_term_matcher
+from tools.metrics import summarize_metrics
 
-def highlight_terms(text: str, terms: list) -> str:
-    """주어진 텍스트에서 용어들을 찾아 볼드 처리하고 파란색으로 강조하되, 코드 블록과 인라인 코드는 제외합니다."""
+def highlight_terms(text: str, terms) -> str:
+    """주어진 텍스트에서 용어들을 찾아 볼드 처리하고 파란색으로 강조하되, 코드 블록과 인라인 코드는 제외합니다.
+
+    terms에는 용어 리스트나 미리 만든 TermMatcher를 넘길 수 있습니다. 같은 용어 리스트에 대한 매처는
+    한 번만 만들어 재사용하므로 문단마다 거대한 정규식을 다시 컴파일하지 않습니다.
+    """
     if not terms:
         return text
+    return get_term_matcher(terms).highlight(text)
+
+def display_metrics_summary(records: list[dict]):
+    """번역 실행의 지연시간·토큰·비용 요약과 문단별 지표를 표시합니다."""
+    if not records:
+        return
+    summary = summarize_metrics(records)
+
+    def fmt(value, spec):
+        return "-" if value is None else format(value, spec)
+
+    cache_rate = summary["cache_hit_rate"]
+
+    with st.expander("📊 번역 성능 지표", expanded=True):
+        cols = st.columns(5)
+        cols[0].metric("LLM 요청", f"{summary['requests']}건", f"오류 {summary['errors']} · 재시도 {summary['retries']}", delta_color="off")
+        cols[1].metric("평균 첫 토큰 시간", f"{fmt(summary['avg_ttft_s'], '.2f')}초", f"p95 지연 {fmt(summary['p95_latency_s'], '.1f')}초", delta_color="off")
+        cols[2].metric("평균 생성 속도", f"{fmt(summary['avg_tokens_per_s'], '.1f')} tok/s")
+        cols[3].metric(
+            "프롬프트 캐시 적중률",
+            f"{fmt(cache_rate * 100 if cache_rate is not None else None, '.0f')}%",
+            f"캐시 읽기 {summary['cache_read_tokens']:,} 토큰 · {summary['cache_hit_requests']}건",
+            delta_color="off"
+        )
+        cols[4].metric("예상 비용", f"${fmt(summary['cost_usd'], '.4f')}", f"입력 {summary['input_tokens']:,} · 출력 {summary['output_tokens']:,} 토큰", delta_color="off")
+        st.dataframe(records, use_container_width=True)
 
-    # 긴 용어를 먼저 처리하기 위해 길이를 기준으로 내림차순 정렬
-    sorted_terms = sorted(terms, key=len, reverse=True)
+def display_cost_estimate(estimate: dict):
+    """번역 전에 예측한 토큰 수와 모델별 예상 비용, 문단별 예측값을 표시합니다."""
+    def fmt_cost(cost):
+        return "가격 정보 없음" if cost is None else f"${cost:,.4f}"
+
+    with st.expander("💰 번역 비용 미리 보기", expanded=True):
+        cols = st.columns(3)
+        cols[0].metric("LLM 요청", f"{estimate['requests']}건")
+        cols[1].metric("입력 토큰", f"{estimate['input_tokens']:,}", f"캐시 읽기 {estimate['cache_read_tokens']:,}", delta_color="off")
+        cols[2].metric("출력 토큰", f"{estimate['output_tokens']:,}")
+        for model, cost in estimate["costs"].items():
+            st.markdown(f"- **{model}**: {fmt_cost(cost)}")
+        st.caption("번역 메모리·기존 번역에서 재사용하는 문단을 빼지 않은 근사치이며, 출력 토큰은 원문 토큰 수에서 추정합니다.")
+        st.dataframe(
+            [
+                {
+                    "문단": chunk["index"] + 1,
+                    "입력 토큰": chunk["input_tokens"],
+                    "출력 토큰": chunk["output_tokens"],
+                    **{model: cost for model, cost in chunk.get("cost_usd", {}).items()},
+                }
+                for chunk in estimate["chunks"]
+            ],
+            use_container_width=True
+        )
+
+def display_glossary_compliance(report: dict):
+    """번역 결과의 단어사전 용어 준수율과 지정한 번역어를 쓰지 않은 문단을 표시합니다."""
+    if not report["checked"]:
+        return
+    title = f"📖 단어사전 준수율 {report['compliance_rate']:.0%} ({report['compliant']}/{report['checked']})"
+    with st.expander(title, expanded=False):
+        if not report["violations"]:
+            st.success("모든 용어를 단어사전의 번역어로 번역했습니다.")
+            return
+        st.dataframe(
+            [
+                {"문단": v["index"] + 1, "원문 용어": v["source"], "지정한 번역어": ", ".join(v["expected"])}
+                for v in report["violations"]
+            ],
+            use_container_width=True
+        )
+
+@lru_cache(maxsize=4096)
+def _highlight_cached(text: str, matcher: TermMatcher) -> str:
+    """문단 내용과 매처가 같으면 강조 결과를 다시 계산하지 않습니다."""
+    return matcher.highlight(text)
+
+@st.fragment
+def _display_chunk(i, source_chunk, total, source_matcher, target_matcher, result_title):
+    """문단 하나를 표시합니다. 수정/완료 버튼은 이 문단만 다시 그립니다."""
+    st.subheader(f"문단 {i+1}/{total}")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("### 원본")
+        highlighted_source = _highlight_cached(source_chunk, source_matcher)
+        with st.container(border=True):
+            st.markdown(highlighted_source, unsafe_allow_html=True)
     
-    # 코드 블록, 인라인 코드, 또는 강조할 용어를 찾는 정규식
-    # 1. 코드 블록 (```...```)
-    # 2. 인라인 코드 (`...`)
-    # 3. 강조할 용어들
-    term_pattern = '|'.join(re.escape(term) for term in sorted_terms)
-    pattern = re.compile(
-        rf"(```.*?```|`.*?`|{term_pattern})", 
-        re.DOTALL | re.IGNORECASE
+    with col2:
+        is_editing = st.session_state.get(f"editing_chunk_{i}", False)
+        
+        title_col, button_col = st.columns([0.8, 0.2])
+
+        with title_col:
+            st.markdown(f"### {result_title}")
+
+        if is_editing:
+            # 수정 모드
+            with button_col:
+                if st.button("완료", key=f"done_button_{i}", use_container_width=True):
+                    # 수정된 내용을 저장하고 수정 모드 종료
+                    edited_content = st.session_state.get(f"temp_edit_{i}", "")
+                    st.session_state[f"edited_chunk_{i}"] = edited_content
+                    st.session_state[f"editing_chunk_{i}"] = False
+                    st.session_state[f"reviewed_chunk_{i}"] = True
+                    # 임시 수정 키 삭제
+                    if f"temp_edit_{i}" in st.session_state:
+                        del st.session_state[f"temp_edit_{i}"]
+                    st.rerun(scope="fragment")
+            
+            # 수정용 임시 키 초기화 (수정 모드 시작 시에만)
+            if f"temp_edit_{i}" not in st.session_state:
+                st.session_state[f"temp_edit_{i}"] = st.session_state.get(f"edited_chunk_{i}", "")
+            
+            current_text = st.session_state.get(f"temp_edit_{i}", "")
+            height = len(current_text.splitlines()) * 25
+            st.text_area(
+                label="번역 수정",
+                value=current_text,
+                key=f"temp_edit_{i}",
+                height=max(height, 100),
+                label_visibility="collapsed"
+            )
+        else:
+            # 읽기 전용 모드
+            with button_col:
+                if st.button("수정", key=f"edit_button_{i}", use_container_width=True):
+                    st.session_state[f"editing_chunk_{i}"] = True
+                    st.rerun(scope="fragment")
+
+            with st.container(border=True):
+                translated_text = st.session_state.get(f"edited_chunk_{i}", "")
+                highlighted_target = _highlight_cached(translated_text, target_matcher)
+                st.markdown(highlighted_target, unsafe_allow_html=True)
+
+def display_job_progress(snapshot: dict, source_chunks: list[str], source_terms, target_terms, prompted=()):
+    """백그라운드 번역 작업(tools.jobs.TranslationJob.snapshot())의 진행 상황과 문단별 결과를 표시합니다.
+
+    화면은 작업 상태를 읽기만 하므로 이 함수를 주기적으로 다시 호출해 진행 상황을 갱신합니다.
+    """
+    total = snapshot["total"]
+    st.progress(
+        snapshot["completed"] / total if total else 1.0,
+        text=f"{snapshot['completed']}/{total} 문단 완료 · 오류 {len(snapshot['errors'])} · "
+             f"번역 메모리 {snapshot['cached']} · {snapshot['elapsed_s']:.0f}초 경과"
     )
 
-    def replace_match(match):
-        matched_text = match.group(0)
-        # 코드 블록이나 인라인 코드인 경우, 그대로 반환
-        if matched_text.startswith('`'):
-            return matched_text
-        # 용어인 경우, 볼드 처리하고 파란색으로 강조하여 반환
-        return f'<span style="color: blue; font-weight: bold;">{matched_text}</span>'
+    page_size = 10
+    page_count = max(1, math.ceil(total / page_size))
+    if st.session_state.get("job_page", 1) > page_count:
+        st.session_state["job_page"] = page_count
+    page = st.number_input(f"페이지 (전체 {page_count})", min_value=1, max_value=page_count, key="job_page")
 
-    return pattern.sub(replace_match, text)
+    source_matcher = get_term_matcher(source_terms)
+    target_matcher = get_term_matcher(target_terms)
+    start = (page - 1) * page_size
+    for i in range(start, min(start + page_size, total)):
+        st.subheader(f"문단 {i+1}/{total}")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("### 원본")
+            with st.container(border=True):
+                st.markdown(_highlight_cached(source_chunks[i], source_matcher), unsafe_allow_html=True)
+        with col2:
+            st.markdown("### 번역 결과")
+            with st.container(border=True):
+                text = snapshot["texts"].get(i)
+                if i in snapshot["errors"]:
+                    st.error(f"번역 중 오류 발생: {snapshot['errors'][i]}")
+                elif i in snapshot["done"]:
+                    if i in prompted:
+                        st.markdown(_highlight_cached(text, target_matcher), unsafe_allow_html=True)
+                    else:
+                        st.markdown(text)
+                elif text:
+                    st.markdown(text + "▌")  # 실시간 커서 효과
+                else:
+                    st.markdown("⏳ 번역 대기 중...")
+
+def display_language_progress(lang: str, snapshot: dict, output_path: str):
+    """추가 언어 번역 작업 하나의 진행 상황을 한 줄로 표시합니다."""
+    total = snapshot["total"]
+    status = {
+        "queued": "⏳ 대기 중",
+        "running": "🔄 번역 중",
+        "done": f"✅ 저장됨: {output_path}",
+        "cancelled": "⏹️ 취소됨",
+        "failed": f"❌ 실패 {snapshot['error'] or ''}".rstrip(),
+    }[snapshot["status"]]
+    st.progress(
+        snapshot["completed"] / total if total else 1.0,
+        text=f"**{lang}** · {snapshot['completed']}/{total} 문단 · 오류 {len(snapshot['errors'])} · "
+             f"번역 메모리 {snapshot['cached']} · {status}"
+    )
+
+def display_translation_results(source_chunks, target_chunks, source_terms, target_terms, result_title, save_path,
+                                reviewed=None):
+    """번역 결과를 표시하고 편집할 수 있는 공통 함수
 
-def display_translation_results(source_chunks, target_chunks, source_terms, target_terms, result_title, save_path):
-    """번역 결과를 표시하고 편집할 수 있는 공통 함수"""
+    긴 문서도 빠르게 반응하도록 현재 페이지의 문단만 그리고, 강조 결과는 문단 내용별로 캐시합니다.
+    수정 후 '완료'를 누른 문단은 검수된 문단으로 표시해 저장할 때 문단 배치 정보에 함께 기록합니다.
+    reviewed에는 이전에 기록된 문단별 검수 여부를 넘깁니다.
+    """
     # 각 청크의 수정 상태 초기화
     for i in range(len(source_chunks)):
         if f"editing_chunk_{i}" not in st.session_state:
             st.session_state[f"editing_chunk_{i}"] = False
+        if f"reviewed_chunk_{i}" not in st.session_state:
+            st.session_state[f"reviewed_chunk_{i}"] = bool(reviewed and i < len(reviewed) and reviewed[i])
         # target_chunks에서 해당 청크를 edited_chunk로 초기화
         if f"edited_chunk_{i}" not in st.session_state and i < len(target_chunks):
             st.session_state[f"edited_chunk_{i}"] = target_chunks[i]
 
-    for i, source_chunk in enumerate(source_chunks):
-        st.subheader(f"문단 {i+1}/{len(source_chunks)}")
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("### 원본")
-            highlighted_source = highlight_terms(source_chunk, source_terms)
-            with st.container(border=True):
-                st.markdown(highlighted_source, unsafe_allow_html=True)
-        
-        with col2:
-            is_editing = st.session_state.get(f"editing_chunk_{i}", False)
-            
-            title_col, button_col = st.columns([0.8, 0.2])
-
-            with title_col:
-                st.markdown(f"### {result_title}")
-
-            if is_editing:
-                # 수정 모드
-                with button_col:
-                    if st.button("완료", key=f"done_button_{i}", use_container_width=True):
-                        # 수정된 내용을 저장하고 수정 모드 종료
-                        edited_content = st.session_state.get(f"temp_edit_{i}", "")
-                        st.session_state[f"edited_chunk_{i}"] = edited_content
-                        st.session_state[f"editing_chunk_{i}"] = False
-                        # 임시 수정 키 삭제
-                        if f"temp_edit_{i}" in st.session_state:
-                            del st.session_state[f"temp_edit_{i}"]
-                        st.rerun()
-                
-                # 수정용 임시 키 초기화 (수정 모드 시작 시에만)
-                if f"temp_edit_{i}" not in st.session_state:
-                    st.session_state[f"temp_edit_{i}"] = st.session_state.get(f"edited_chunk_{i}", "")
-                
-                current_text = st.session_state.get(f"temp_edit_{i}", "")
-                height = len(current_text.splitlines()) * 25
-                st.text_area(
-                    label="번역 수정",
-                    value=current_text,
-                    key=f"temp_edit_{i}",
-                    height=max(height, 100),
-                    label_visibility="collapsed"
-                )
-            else:
-                # 읽기 전용 모드
-                with button_col:
-                    if st.button("수정", key=f"edit_button_{i}", use_container_width=True):
-                        st.session_state[f"editing_chunk_{i}"] = True
-                        st.rerun()
-
-                with st.container(border=True):
-                    translated_text = st.session_state.get(f"edited_chunk_{i}", "")
-                    highlighted_target = highlight_terms(translated_text, target_terms)
-                    st.markdown(highlighted_target, unsafe_allow_html=True)
+    total = len(source_chunks)
+    size_col, page_col = st.columns(2)
+    with size_col:
+        page_size = st.selectbox("페이지당 문단 수", [5, 10, 20, 50, 100], index=1, key="result_page_size")
+    page_count = max(1, math.ceil(total / page_size))
+    # 페이지당 문단 수를 늘려 페이지 수가 줄어든 경우 현재 페이지를 범위 안으로 맞춥니다.
+    if st.session_state.get("result_page", 1) > page_count:
+        st.session_state["result_page"] = page_count
+    with page_col:
+        page = st.number_input(f"페이지 (전체 {page_count})", min_value=1, max_value=page_count, key="result_page")
+
+    source_matcher = get_term_matcher(source_terms)
+    target_matcher = get_term_matcher(target_terms)
+    start = (page - 1) * page_size
+    for i in range(start, min(start + page_size, total)):
+        _display_chunk(i, source_chunks[i], total, source_matcher, target_matcher, result_title)
 
     # Change the output path for the '수정된 내용 파일에 저장' button
     if st.button("수정된 내용 파일에 저장", type="primary"):
         final_chunks = []
+        reviewed_chunks = []
         for i in range(len(source_chunks)):
             edited_content = st.session_state.get(f"edited_chunk_{i}", "")
             final_chunks.append(edited_content)
+            reviewed_chunks.append(st.session_state.get(f"reviewed_chunk_{i}", False))
         
         final_content = "\n".join(final_chunks)
         
@@ -109,6 +259,8 @@ def display_translation_results(source_chunks, target_chunks, source_terms, targ
         output_dir.mkdir(parents=True, exist_ok=True)
         with open(save_path, 'w', encoding='utf-8') as f:
             f.write(final_content)
+        save_source_snapshot(save_path, source_chunks)
+        save_chunk_layout(save_path, source_chunks, final_chunks, reviewed_chunks)
         
         st.session_state.mtpe_exist = True
         
@@ -0,0 +1,43 @@
+"""
+번역 폴더의 번역 파일을 원본과 문단 단위로 짝지어 읽는 도구 (준수 검사·퍼지 번역 메모리에서 사용)
+"""
+from pathlib import Path
+from tools.chunking import load_chunk_layout, read_by_line_counts
+from tools.incremental import source_snapshot_path
+from tools.splitter import iter_markdown_file
+
+
+def read_translation_pair(source_path: str, target_path: str) -> tuple[list, list]:
+    """원본·번역 파일을 읽어 문단 리스트로 나눕니다.
+
+    파일 전체를 한 번에 읽지 않고 한 줄씩 읽으며, 문단 경계 기록이 있으면 그 경계로, 없거나 맞지 않으면
+    제목(#) 기준으로 나눕니다. (tools.utils.split_translation_pair와 같은 결과)
+    """
+    layout = load_chunk_layout(target_path)
+    if layout:
+        source_chunks = read_by_line_counts(source_path, layout["source"])
+        if source_chunks is not None:
+            target_chunks = read_by_line_counts(target_path, layout["target"])
+            if target_chunks is not None:
+                return source_chunks, target_chunks
+    source_chunks = [chunk.text for chunk in iter_markdown_file(source_path)]
+    target_chunks = [chunk.text for chunk in iter_markdown_file(target_path)]
+    return source_chunks, target_chunks
+
+
+def iter_translated_documents(directory: str, source_for=None):
+    """폴더 안의 번역 파일마다 (번역 경로, 원본 문단, 번역 문단)을 생성합니다.
+
+    source_for(번역 경로)가 원본 경로를 돌려주고 그 파일이 있으면 그 원본과, 없으면 원본 스냅샷(.source.md)과
+    짝지으며, 둘 다 없는 파일은 건너뜁니다.
+    """
+    for target_path in sorted(Path(directory).rglob("*.md")):
+        if target_path.name.endswith(".source.md"):
+            continue
+        source_path = source_for(target_path) if source_for else None
+        if source_path is None or not Path(source_path).is_file():
+            source_path = source_snapshot_path(target_path)
+            if not source_path.exists():
+                continue
+        source_chunks, target_chunks = read_translation_pair(source_path, target_path)
+        yield target_path, source_chunks, target_chunks
@@ -0,0 +1,132 @@
+"""
+여러 문단을 동시에 번역하는 스트리밍 번역 엔진
+"""
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from tools.scheduler import (
+    OVERLOADED,
+    RATE_LIMITED,
+    RETRYABLE,
+    backoff_delay,
+    classify_error,
+    retry_after_seconds
+)
+
+
+@dataclass
+class ChunkEvent:
+    """문단 번역의 진행 상황을 전달하는 이벤트"""
+    index: int
+    text: str
+    done: bool = False
+    error: Exception | None = None
+    cached: bool = False  # 번역 메모리에서 가져온 경우 True
+    stats: dict | None = None  # LLM을 호출한 문단의 완료 이벤트에만 채워지는 요청 통계
+
+
+def _stream_chunk(llm, index: int, prompt, events: queue.Queue, limiter=None, on_complete=None,
+                  max_retries: int = 0):
+    """한 문단을 스트리밍으로 번역하면서 누적된 번역문을 이벤트 큐에 넣습니다.
+
+    사용량 제한(429)·과부하·일시적 오류는 최대 max_retries번까지 지수 백오프로 다시 시도하고,
+    Retry-After가 있으면 그 시간 이상 기다립니다. 재시도하면 그때까지 받은 번역은 버리고 처음부터 받습니다.
+    """
+    attempts = 0
+    throttled = 0
+    while True:
+        attempts += 1
+        text = ""
+        error = None
+        usage = None
+        start = first_token = None
+        try:
+            if limiter is not None:
+                limiter.acquire()
+            try:
+                start = time.perf_counter()
+                for response in llm.stream(prompt):
+                    # 제공자가 사용량을 보고하면 보통 마지막 조각에 담겨 옵니다.
+                    usage = getattr(response, "usage_metadata", None) or usage
+                    content = response.content
+                    if content:
+                        if first_token is None:
+                            first_token = time.perf_counter()
+                        text += content
+                        events.put(ChunkEvent(index, text))
+            finally:
+                if limiter is not None:
+                    limiter.release()
+        except Exception as e:
+            error = e
+
+        if error is None:
+            if hasattr(limiter, "on_success"):
+                limiter.on_success()
+            break
+
+        kind = classify_error(error)
+        retry_after = None
+        if kind in (RATE_LIMITED, OVERLOADED):
+            throttled += 1
+            retry_after = retry_after_seconds(error)
+            if hasattr(limiter, "on_throttle"):
+                limiter.on_throttle(retry_after)
+        if kind not in RETRYABLE or attempts > max_retries:
+            break
+        if text:
+            events.put(ChunkEvent(index, ""))  # 화면에 표시된 부분 번역을 지웁니다.
+        time.sleep(max(retry_after or 0.0, backoff_delay(attempts - 1)))
+
+    end = time.perf_counter()
+    stats = {
+        "ttft_s": first_token - start if first_token is not None else None,
+        "latency_s": end - start if start is not None else 0.0,
+        "usage": dict(usage) if usage else None,
+        "attempts": attempts,
+        "throttled": throttled,
+        "error_kind": classify_error(error) if error is not None else None,
+    }
+    event = ChunkEvent(index, text, done=True, error=error, stats=stats)
+
+    # 화면(소비자)이 중단되더라도 결과가 남도록 작업 스레드에서 바로 저장합니다.
+    if on_complete is not None:
+        try:
+            on_complete(event)
+        except Exception as e:
+            event.error = event.error or e
+    events.put(event)
+
+
+def translate_chunks(llm, prompts: dict, max_workers: int = 4, limiter=None, on_complete=None,
+                     max_retries: int = 0):
+    """문단별 프롬프트를 최대 max_workers개씩 동시에 번역하며 ChunkEvent를 생성합니다.
+
+    prompts는 {문단 인덱스: 프롬프트} 형태이며, llm은 `.stream(prompt)`를 지원하는
+    LangChain 채팅 모델(ChatLiteLLM 등)이면 됩니다. 이벤트는 도착한 순서대로 생성되므로
+    화면에는 문단 인덱스별로 미리 만들어 둔 자리에 그려야 문서 순서가 유지됩니다.
+
+    limiter(threading.Semaphore 또는 tools.scheduler.AdaptiveLimiter)를 넘기면 동시 요청 수를 제한합니다.
+    AdaptiveLimiter는 여러 문서·사용자가 함께 쓰며 제공자의 사용량 제한에 맞춰 한도를 조절합니다.
+    max_retries는 재시도 가능한 오류에 대해 문단별로 다시 시도하는 최대 횟수입니다.
+    on_complete(event)는 문단 하나가 끝날 때마다 완료 이벤트를 받아 작업 스레드에서 호출됩니다.
+    """
+    if not prompts:
+        return
+
+    events = queue.Queue()
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    try:
+        for index, prompt in prompts.items():
+            executor.submit(_stream_chunk, llm, index, prompt, events, limiter, on_complete, max_retries)
+
+        remaining = len(prompts)
+        while remaining:
+            event = events.get()
+            if event.done:
+                remaining -= 1
+            yield event
+    finally:
+        # 소비자가 중간에 멈춘 경우 아직 시작하지 않은 문단은 취소합니다.
+        executor.shutdown(wait=False, cancel_futures=True)
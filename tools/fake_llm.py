@@ -0,0 +1,114 @@
+"""
+API 호출 없이 벤치마크·테스트에 사용하는 결정적(deterministic) 가짜 채팅 모델
+"""
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from tools.tokens import estimate_tokens, prompt_to_text as prompt_to_text_all
+
+_TOKEN = re.compile(r"\S+\s*|\s+")
+
+
+@dataclass
+class FakeChunk:
+    """LangChain AIMessageChunk처럼 `.content`(와 마지막 조각의 `.usage_metadata`)를 가진 스트리밍 조각"""
+    content: str
+    usage_metadata: dict | None = None
+
+
+class FakeRateLimitError(Exception):
+    """제공자의 429 응답을 흉내 내는 오류 (status_code, retry_after 포함)"""
+
+    def __init__(self, retry_after: float | None = None):
+        super().__init__("429 Too Many Requests (fake)")
+        self.status_code = 429
+        self.retry_after = retry_after
+
+
+def prompt_text(prompt) -> str:
+    """문자열 프롬프트 또는 메시지 리스트에서 마지막 메시지의 텍스트를 꺼냅니다."""
+    if isinstance(prompt, str):
+        return prompt
+    content = prompt[-1].content if hasattr(prompt[-1], "content") else prompt[-1]["content"]
+    if isinstance(content, list):
+        return "".join(block.get("text", "") for block in content if isinstance(block, dict))
+    return content
+
+
+class FakeChatModel:
+    """ChatLiteLLM 대신 쓸 수 있는 로컬 채팅 모델
+
+    첫 토큰까지 ttft초를 기다린 뒤 초당 tokens_per_second개의 속도로 응답을 스트리밍합니다.
+    응답은 response_fn(프롬프트 텍스트)의 결과이며, 기본값은 프롬프트를 그대로 돌려줍니다.
+
+    사용량 제한을 흉내 내려면 capacity(동시에 처리할 수 있는 요청 수, 넘으면 429)나
+    error_rate(무작위 429 비율)를 지정합니다. retry_after는 429 응답에 담을 대기 시간(초)입니다.
+
+    prompt_cache가 True이면 메시지 리스트 프롬프트의 마지막 메시지 앞부분(접두부)을 캐시한 것처럼
+    마지막 조각에 토큰 사용량(input_token_details의 cache_read/cache_creation 포함)을 보고합니다.
+    """
+
+    def __init__(self, ttft: float = 0.2, tokens_per_second: float = 100.0, response_fn=None,
+                 capacity: int | None = None, error_rate: float = 0.0,
+                 retry_after: float | None = None, seed: int = 0, prompt_cache: bool = False):
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second
+        self.response_fn = response_fn or (lambda text: text)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.prompt_cache = prompt_cache
+        self._cached_prefixes = set()
+        self.requests = 0
+        self.rate_limited = 0
+        self._active = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _admit(self):
+        with self._lock:
+            self.requests += 1
+            over_capacity = self.capacity is not None and self._active >= self.capacity
+            if over_capacity or self._rng.random() < self.error_rate:
+                self.rate_limited += 1
+                raise FakeRateLimitError(self.retry_after)
+            self._active += 1
+
+    def stream(self, prompt):
+        self._admit()
+        try:
+            response = self.response_fn(prompt_text(prompt))
+            start = time.perf_counter()
+            for n, token in enumerate(_TOKEN.findall(response)):
+                # 누적 지연을 기준으로 기다려 sleep 오차가 쌓이지 않게 합니다.
+                due = start + self.ttft + n / self.tokens_per_second
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                yield FakeChunk(token)
+            if self.prompt_cache:
+                yield FakeChunk("", self._usage(prompt, response))
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _usage(self, prompt, response: str) -> dict:
+        input_tokens = estimate_tokens(prompt_to_text_all(prompt))
+        cache_read = cache_creation = 0
+        if not isinstance(prompt, str) and len(prompt) > 1:
+            prefix = prompt_to_text_all(prompt[:-1])
+            with self._lock:
+                hit = prefix in self._cached_prefixes
+                self._cached_prefixes.add(prefix)
+            if hit:
+                cache_read = estimate_tokens(prefix)
+            else:
+                cache_creation = estimate_tokens(prefix)
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": estimate_tokens(response),
+            "total_tokens": input_tokens + estimate_tokens(response),
+            "input_token_details": {"cache_read": cache_read, "cache_creation": cache_creation},
+        }
@@ -0,0 +1,42 @@
+"""
+중간에 중단되더라도 반쯤 쓰인 파일이 남지 않도록 파일을 원자적으로 저장하는 도구 (다른 tools 모듈에 의존하지 않음)
+"""
+import os
+import stat
+import tempfile
+from pathlib import Path
+
+# os.umask는 값을 바꿔야만 읽을 수 있으므로, 여러 스레드가 파일을 만들기 전인 가져올 때 한 번만 읽습니다.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _target_mode(path: Path) -> int:
+    """기존 파일이 있으면 그 권한을, 없으면 open()으로 새로 만들 때와 같은 권한(0666 & ~umask)을 반환합니다."""
+    try:
+        return stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def write_bytes_atomic(path, data: bytes):
+    """임시 파일에 쓴 뒤 교체하여, 중간에 중단되더라도 반쯤 쓰인 파일이 남지 않게 저장합니다.
+
+    mkstemp가 만드는 임시 파일은 소유자만 읽을 수 있으므로(0600), 교체하기 전에 보통 파일과 같은 권한으로 바꿉니다.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, _target_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def write_text_atomic(path, content: str):
+    """텍스트를 UTF-8로 원자적으로 저장합니다. (write_bytes_atomic 참고)"""
+    write_bytes_atomic(path, content.encode('utf-8'))
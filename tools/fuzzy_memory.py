@@ -0,0 +1,219 @@
+"""
+사후교정(mtpe) 번역에서 비슷한 문단을 찾아 재사용하는 퍼지 번역 메모리 (MinHash/LSH)
+"""
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from tools.chunking import load_chunk_layout
+from tools.documents import iter_translated_documents
+from tools.placeholders import protect_markdown
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_SHINGLE_SIZE = 3
+_MIN_SHINGLES = 3  # 이보다 짧은 문단(제목 한 줄 등)은 참고 번역으로 쓰지 않습니다.
+
+REFERENCE_INSTRUCTION = (
+    "\n\n(참고: 아래는 사람이 검수한 비슷한 문단의 원문과 번역입니다. 같은 표현은 같은 용어와 문체로 번역하되, "
+    "원문이 다른 부분은 위의 원문을 따르세요. 참고 번역 자체는 출력하지 마세요.)\n"
+    "<reference_source>\n{source}\n</reference_source>\n"
+    "<reference_translation>\n{target}\n</reference_translation>"
+)
+
+
+def shingles(text: str) -> frozenset:
+    """소문자 단어·기호 토큰의 3-gram 집합을 반환합니다. 토큰이 3개보다 적으면 토큰 자체를 사용합니다."""
+    tokens = _TOKEN.findall(text.lower())
+    if len(tokens) < _SHINGLE_SIZE:
+        return frozenset(tokens)
+    return frozenset(" ".join(tokens[i:i + _SHINGLE_SIZE]) for i in range(len(tokens) - _SHINGLE_SIZE + 1))
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+@dataclass
+class FuzzyMatch:
+    """비슷한 문단 검색 결과 (score는 3-gram 집합의 자카드 유사도, exact는 공백만 다른 같은 문단인지 여부)"""
+    score: float
+    source: str
+    target: str
+    origin: str = ""
+    exact: bool = False
+
+
+class FuzzyMemory:
+    """검수된 (원문, 번역) 문단 쌍에 대한 MinHash/LSH 색인
+
+    각 문단의 3-gram을 한 번씩만 해시하는 one-permutation MinHash로 서명을 만들고, 서명을 bands개의
+    구간으로 나눠 한 구간이라도 같은 문단만 후보로 고른 뒤 실제 자카드 유사도로 확인합니다.
+    기본값(64개 해시, 16개 구간)에서는 유사도 0.5 이상인 문단을 대부분 찾습니다.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16):
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.entries = []  # (원문, 번역, 3-gram 집합, 출처)
+        self._buckets = {}
+        self._exact = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _signature(self, grams: frozenset) -> list:
+        signature = [None] * self.num_perm
+        for gram in grams:
+            h = hash(gram) & 0xFFFFFFFFFFFFFFFF
+            slot, value = h % self.num_perm, h // self.num_perm
+            if signature[slot] is None or value < signature[slot]:
+                signature[slot] = value
+        return signature
+
+    def _band_keys(self, grams: frozenset):
+        signature = self._signature(grams)
+        for band in range(self.bands):
+            rows = tuple(signature[band * self.rows:(band + 1) * self.rows])
+            if any(row is not None for row in rows):
+                yield band, rows
+
+    def add(self, source: str, target: str, origin: str = ""):
+        """검수된 문단 쌍을 추가합니다. 원문이 같은 쌍은 나중에 추가한 번역을 사용합니다."""
+        if not source.strip() or not target.strip():
+            return
+        key = " ".join(source.split())
+        if key in self._exact:
+            entry_id = self._exact[key]
+            self.entries[entry_id] = (source, target, self.entries[entry_id][2], origin)
+            return
+        grams = shingles(source)
+        entry_id = len(self.entries)
+        self.entries.append((source, target, grams, origin))
+        self._exact[key] = entry_id
+        for band_key in self._band_keys(grams):
+            self._buckets.setdefault(band_key, []).append(entry_id)
+
+    def query(self, text: str, threshold: float = 0.5) -> FuzzyMatch | None:
+        """가장 비슷한 문단을 찾습니다. 유사도가 threshold보다 낮으면 None을 반환합니다.
+
+        공백만 다른 같은 문단은 유사도 1.0으로 바로 찾습니다.
+        """
+        exact = self._exact.get(" ".join(text.split()))
+        if exact is not None:
+            source, target, _, origin = self.entries[exact]
+            return FuzzyMatch(1.0, source, target, origin, exact=True)
+
+        grams = shingles(text)
+        candidates = set()
+        for band_key in self._band_keys(grams):
+            candidates.update(self._buckets.get(band_key, ()))
+        best = None
+        for entry_id in candidates:
+            source, target, entry_grams, origin = self.entries[entry_id]
+            score = jaccard(grams, entry_grams)
+            if score >= threshold and (best is None or score > best.score):
+                best = FuzzyMatch(score, source, target, origin)
+        return best
+
+
+def iter_reviewed_pairs(mtpe_dir: str):
+    """사후교정 폴더의 번역 파일과 원본 스냅샷(.source.md)에서 검수된 (원문 문단, 번역 문단, 파일 경로)를 생성합니다.
+
+    편집 화면에서 저장할 때 문단 배치 정보(.chunks.json)에 기록한 문단별 검수 여부를 보고, 사람이 확인한
+    문단만 사용합니다. 기계번역을 그대로 저장한 문단까지 검수 번역으로 재사용하지 않기 위해서입니다.
+    스냅샷이나 검수 기록이 없거나 원본과 번역의 문단 수가 맞지 않는 파일은 건너뜁니다.
+    """
+    for target_path, source_chunks, target_chunks in iter_translated_documents(mtpe_dir):
+        layout = load_chunk_layout(target_path)
+        reviewed = layout.get("reviewed") if layout else None
+        if not reviewed or not len(source_chunks) == len(target_chunks) == len(reviewed):
+            continue
+        for source, target, flag in zip(source_chunks, target_chunks, reviewed):
+            if flag:
+                yield source, target, str(target_path)
+
+
+_loaded = {}
+_load_lock = threading.Lock()
+
+
+def _corpus_signature(mtpe_dir: Path) -> tuple:
+    files = sorted(p for p in mtpe_dir.rglob("*") if p.suffix in (".md", ".json") and p.is_file())
+    return tuple((str(p), p.stat().st_mtime_ns, p.stat().st_size) for p in files)
+
+
+def load_fuzzy_memory(mtpe_dir: str) -> FuzzyMemory:
+    """사후교정 폴더로 퍼지 번역 메모리를 만듭니다. 폴더의 파일이 바뀌지 않았으면 이미 만든 색인을 재사용합니다."""
+    path = Path(mtpe_dir)
+    if not path.is_dir():
+        return FuzzyMemory()
+    with _load_lock:
+        key = str(path.resolve())
+        signature = _corpus_signature(path)
+        cached = _loaded.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        memory = FuzzyMemory()
+        for source, target, origin in iter_reviewed_pairs(path):
+            memory.add(source, target, origin)
+        _loaded[key] = (signature, memory)
+        return memory
+
+
+def find_fuzzy_matches(memory: FuzzyMemory, source_chunks: list[str], threshold: float = 0.5,
+                       skip=()) -> dict[int, FuzzyMatch]:
+    """문단마다 가장 비슷한 검수 번역을 찾아 {문단 인덱스: FuzzyMatch}로 반환합니다.
+
+    빈 문단, skip에 있는 문단(이미 재사용하는 문단 등), 너무 짧은 문단은 찾지 않습니다.
+    """
+    matches = {}
+    if not len(memory):
+        return matches
+    for i, chunk in enumerate(source_chunks):
+        if i in skip or not chunk.strip():
+            continue
+        match = memory.query(chunk, threshold)
+        if match is None:
+            continue
+        if match.score < 1.0 and len(shingles(chunk)) < _MIN_SHINGLES:
+            continue
+        matches[i] = match
+    return matches
+
+
+def split_fuzzy_matches(matches: dict, reuse_threshold: float = 1.0) -> tuple[dict[int, str], dict[int, FuzzyMatch]]:
+    """검색 결과를 그대로 재사용할 번역({문단 인덱스: 번역})과 참고 번역으로 넣을 결과로 나눕니다.
+
+    reuse_threshold가 1.0 이상이면 공백만 다른 같은 문단만 그대로 재사용합니다.
+    """
+    reused, references = {}, {}
+    for i, match in matches.items():
+        if match.exact if reuse_threshold >= 1.0 else match.score >= reuse_threshold:
+            reused[i] = match.target
+        else:
+            references[i] = match
+    return reused, references
+
+
+def _hide_protected(text: str, protect) -> str:
+    if not protect:
+        return text
+    masked, mapping = protect_markdown(text, protect)
+    for placeholder in mapping:
+        masked = masked.replace(placeholder, "[…]")
+    return masked
+
+
+def reference_instruction(match: FuzzyMatch, protect=()) -> str:
+    """비슷한 검수 번역을 프롬프트 끝에 붙일 참고 번역(few-shot 예시)으로 만듭니다.
+
+    protect에 지정한 요소(코드 블록 등)는 참고 번역에서 생략해, 문단의 자리표시자 대신 참고 번역의 코드를
+    옮겨 쓰지 않게 하고 입력 토큰도 줄입니다.
+    """
+    return REFERENCE_INSTRUCTION.format(
+        source=_hide_protected(match.source, protect),
+        target=_hide_protected(match.target, protect)
+    )
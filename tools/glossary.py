@@ -0,0 +1,243 @@
+"""
+단어사전 컴파일·색인: 미리 만든 색인으로 단어사전을 빠르게 읽고, 문단에 등장하는 용어만 골라내는 도구
+"""
+import csv
+import json
+import threading
+from functools import cached_property, lru_cache
+from pathlib import Path
+from tools.fileio import write_bytes_atomic
+from tools.matcher import TermMatcher, register_term_matcher
+
+COMPILED_FORMAT_VERSION = 3
+
+
+def term_variants(term: str) -> set[str]:
+    """용어의 단순 복수형/활용형을 만듭니다. 여러 단어로 된 용어는 마지막 단어만 변형합니다."""
+    variants = {term}
+    head, sep, word = term.rpartition(" ")
+    prefix = head + sep
+    lower = word.lower()
+    if len(lower) < 3 or not lower.replace("-", "").isalpha():
+        return variants
+
+    forms = {word + "s", word + "ed", word + "ing"}
+    if lower.endswith(("s", "x", "z", "ch", "sh")):
+        forms.add(word + "es")
+    if lower.endswith("y") and lower[-2] not in "aeiou":
+        forms.update({word[:-1] + "ies", word[:-1] + "ied"})
+    if lower.endswith("e"):
+        forms.update({word + "d", word[:-1] + "ing"})
+    if lower.endswith("s") and not lower.endswith("ss"):
+        forms.add(word[:-1])
+    if lower.endswith("ies"):
+        forms.add(word[:-3] + "y")
+
+    variants.update(prefix + form for form in forms)
+    return variants
+
+
+def _build_glossary_index(sources) -> TermMatcher:
+    terms, values = [], []
+    # 원형을 먼저 등록해 활용형이 다른 용어의 원형과 겹치면 원형이 우선하도록 합니다.
+    for i, source in enumerate(sources):
+        terms.append(source)
+        values.append(i)
+    for i, source in enumerate(sources):
+        for variant in term_variants(source):
+            terms.append(variant)
+            values.append(i)
+    return TermMatcher(terms, values)
+
+
+@lru_cache(maxsize=8)
+def _cached_glossary_index(sources: tuple) -> TermMatcher:
+    return _build_glossary_index(sources)
+
+
+def get_glossary_index(glossary_data: list) -> TermMatcher:
+    """단어사전 원문 용어(활용형 포함)를 항목 인덱스로 찾는 매처를 반환합니다."""
+    if isinstance(glossary_data, CompiledGlossary):
+        return glossary_data.index
+    return _cached_glossary_index(tuple(entry["source"] for entry in glossary_data))
+
+
+def find_glossary_entries(text: str, glossary_data: list, skip_code: bool = False) -> list[int]:
+    """텍스트에 등장하는 단어사전 항목의 인덱스를 순서대로 반환합니다. (대소문자 무시, 단순 활용형 포함)
+
+    단어 단위로만 찾으므로 'Rapid'에서 'API'를 찾지 않고, 'language model'처럼 긴 용어 안에 든
+    'model' 같은 용어도 함께 찾습니다.
+    """
+    return sorted(get_glossary_index(glossary_data).find_values(text, skip_code=skip_code, whole_words=True))
+
+
+def select_glossary_entries(chunk: str, glossary_data: list) -> list:
+    """문단에 등장하는 단어사전 항목만 원래 순서대로 반환합니다. (find_glossary_entries 참고)"""
+    return [glossary_data[i] for i in find_glossary_entries(chunk, glossary_data)]
+
+
+class CompiledGlossary(list):
+    """단어사전 항목 리스트에 미리 만든 색인을 붙인 것
+
+    기존 코드에서는 그대로 항목 리스트로 쓸 수 있고, 아래 속성은 매번 다시 만들지 않고 재사용합니다.
+    - source_terms / target_terms: 원문·번역 용어 리스트
+    - instructions: 프롬프트에 넣을 단어사전 규칙 전체
+    - source_matcher / target_matcher / index: 용어 강조용 매처와 문단별 필터링용 매처 (활용형 포함)
+
+    매처는 처음 사용할 때 만들지만, load_compiled_glossary는 미리 만들어 to_compiled()로 함께 저장합니다.
+    저장된 트라이는 펼친 배열 형태로 읽고 검색 중 필요한 노드만 만들므로, 다시 만드는 것보다 훨씬 빠릅니다.
+    """
+
+    def __init__(self, entries: list):
+        super().__init__(entries)
+        self.source_terms = [entry["source"] for entry in entries]
+        self.target_terms = [target for entry in entries for target in entry["target"]]
+        self.instructions = "\n".join(glossary_instruction(entry) for entry in entries)
+        self.signature = None
+
+    @cached_property
+    def source_matcher(self) -> TermMatcher:
+        return TermMatcher(self.source_terms)
+
+    @cached_property
+    def target_matcher(self) -> TermMatcher:
+        return TermMatcher(self.target_terms)
+
+    @cached_property
+    def index(self) -> TermMatcher:
+        return _build_glossary_index(self.source_terms)
+
+    def to_compiled(self) -> dict:
+        """항목·규칙·매처를 JSON으로 저장할 수 있는 데이터로 만듭니다. (실행 가능한 객체는 담지 않습니다.)"""
+        return {
+            "signature": list(self.signature or ()),
+            "entries": list(self),
+            "instructions": self.instructions,
+            "matchers": {
+                "source": self.source_matcher.to_data(),
+                "target": self.target_matcher.to_data(),
+                "index": self.index.to_data(),
+            },
+        }
+
+    @classmethod
+    def from_compiled(cls, data: dict) -> "CompiledGlossary":
+        """to_compiled()로 만든 데이터에서 단어사전을 만듭니다. 규칙과 매처는 다시 만들지 않습니다."""
+        glossary = cls.__new__(cls)
+        list.__init__(glossary, data["entries"])
+        glossary.source_terms = [entry["source"] for entry in glossary]
+        glossary.target_terms = [target for entry in glossary for target in entry["target"]]
+        glossary.instructions = data["instructions"]
+        glossary.signature = tuple(data["signature"])
+        matchers = data["matchers"]
+        glossary.source_matcher = TermMatcher.from_data(matchers["source"])
+        glossary.target_matcher = TermMatcher.from_data(matchers["target"])
+        glossary.index = TermMatcher.from_data(matchers["index"])
+        return glossary
+
+    def register_matchers(self):
+        """용어 리스트로 강조할 때도 이 단어사전의 매처를 쓰도록 등록합니다."""
+        register_term_matcher(self.source_terms, lambda: self.source_matcher)
+        register_term_matcher(self.target_terms, lambda: self.target_matcher)
+
+
+def normalize_term(term: str) -> str:
+    return " ".join(term.lower().split())
+
+
+def glossary_instruction(entry: dict) -> str:
+    """단어사전 항목 하나를 프롬프트 규칙 한 줄로 만듭니다."""
+    target_str = json.dumps(entry["target"], ensure_ascii=False)
+    return f'- "{entry["source"]}" → {target_str}'
+
+
+def get_glossary_terms(glossary_data: list) -> tuple[list, list]:
+    """단어사전에서 원문/번역문 용어 리스트를 추출합니다."""
+    if isinstance(glossary_data, CompiledGlossary):
+        return glossary_data.source_terms, glossary_data.target_terms
+    source_terms = [entry["source"] for entry in glossary_data]
+    target_terms = []
+    for entry in glossary_data:
+        target = entry["target"]  # 항상 리스트
+        target_terms.extend(target)
+    return source_terms, target_terms
+
+
+def read_glossary_csv(csv_path: str) -> list:
+    """단어사전 CSV를 항목 리스트로 읽습니다. 첫 행([CLS] classification ...)은 건너뜁니다."""
+    data = []
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        rows = list(csv.reader(f))
+    for row in rows[1:]:
+        if not row:  # 빈 줄 방지
+            continue
+        source = row[0].strip()
+        targets = [cell.strip() for cell in row[1:] if cell.strip() != ""]
+        data.append({"source": source, "target": targets})
+    return data
+
+
+def write_glossary_json(data: list, json_path: str):
+    """항목 리스트를 공백 없는 JSON으로 저장합니다."""
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    write_bytes_atomic(Path(json_path), payload.encode('utf-8'))
+
+
+def compiled_glossary_path(json_path: str) -> Path:
+    """컴파일된 단어사전 경로를 반환합니다. (예: glossary/glossary.compiled.json)"""
+    path = Path(json_path)
+    return path.with_name(f"{path.stem}.compiled.json")
+
+
+_loaded = {}
+_load_lock = threading.Lock()
+
+
+def load_compiled_glossary(json_path: str) -> CompiledGlossary:
+    """단어사전을 컴파일된 색인과 함께 읽습니다.
+
+    - 같은 이름의 CSV(glossary.csv)가 JSON보다 새로우면 JSON을 다시 만듭니다.
+    - JSON의 수정 시각·크기가 컴파일 당시와 같으면 컴파일된 파일(JSON, 데이터만 담음)을 바로 읽고,
+      다르면 다시 컴파일해 저장합니다.
+    - 프로세스 안에서는 JSON이 바뀌지 않는 한 같은 객체를 재사용합니다.
+    """
+    path = Path(json_path)
+    csv_path = path.with_suffix(".csv")
+    with _load_lock:
+        if csv_path.exists() and (not path.exists() or csv_path.stat().st_mtime_ns > path.stat().st_mtime_ns):
+            write_glossary_json(read_glossary_csv(csv_path), path)
+
+        stat = path.stat()
+        signature = (COMPILED_FORMAT_VERSION, stat.st_mtime_ns, stat.st_size)
+        key = str(path.resolve())
+        cached = _loaded.get(key)
+        if cached is not None and cached.signature == signature:
+            return cached
+
+        glossary = _read_compiled(compiled_glossary_path(path), signature)
+        if glossary is None:
+            with open(path, 'r', encoding='utf-8') as f:
+                glossary = CompiledGlossary(json.load(f))
+            glossary.signature = signature
+            try:
+                payload = json.dumps(glossary.to_compiled(), ensure_ascii=False, separators=(",", ":"))
+                write_bytes_atomic(compiled_glossary_path(path), payload.encode('utf-8'))
+            except OSError:
+                pass  # 쓰기 권한이 없으면 메모리에서만 사용합니다.
+
+        glossary.register_matchers()
+        _loaded[key] = glossary
+        return glossary
+
+
+def _read_compiled(compiled_path: Path, signature: tuple) -> CompiledGlossary | None:
+    if not compiled_path.exists():
+        return None
+    try:
+        with open(compiled_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if tuple(data["signature"]) != signature:
+            return None
+        return CompiledGlossary.from_compiled(data)
+    except (OSError, ValueError, KeyError, TypeError, IndexError):
+        return None
@@ -0,0 +1,132 @@
+"""
+원본 문서가 바뀌었을 때 변경된 문단만 다시 번역하기 위한 도구
+"""
+import difflib
+from pathlib import Path
+from tools.chunking import pack_chunks
+
+
+def source_snapshot_path(target_path: str) -> Path:
+    """번역 파일과 함께 저장되는 원본 스냅샷 경로를 반환합니다. (예: mt/models_ko.source.md)"""
+    path = Path(target_path)
+    return path.with_name(f"{path.stem}.source{path.suffix}")
+
+
+def save_source_snapshot(target_path: str, source_chunks: list[str]):
+    """번역에 사용한 원본 문단을 번역 파일 옆에 저장합니다."""
+    snapshot_path = source_snapshot_path(target_path)
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(snapshot_path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(source_chunks))
+
+
+def load_source_snapshot(target_path: str) -> str | None:
+    """번역 파일에 대응하는 원본 스냅샷을 읽습니다. 없으면 None을 반환합니다."""
+    snapshot_path = source_snapshot_path(target_path)
+    if not snapshot_path.exists():
+        return None
+    with open(snapshot_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def plan_incremental_update(old_source_chunks: list[str], old_target_chunks: list[str],
+                            new_source_chunks: list[str]) -> dict[int, str]:
+    """이전/새 원본 문단을 정렬해 그대로 재사용할 수 있는 번역을 {새 문단 인덱스: 기존 번역}으로 반환합니다.
+
+    반환값에 없는 문단은 추가되었거나 수정된 문단이므로 새로 번역해야 합니다.
+    이전 원본과 번역의 문단 수가 다르면 정렬할 수 없으므로 빈 딕셔너리를 반환합니다.
+    """
+    if len(old_source_chunks) != len(old_target_chunks):
+        return {}
+    return {j: old_target_chunks[i] for j, i in align_unchanged_chunks(old_source_chunks, new_source_chunks).items()}
+
+
+def align_unchanged_chunks(old_source_chunks: list[str], new_source_chunks: list[str]) -> dict[int, int]:
+    """이전/새 원본 문단을 정렬해 바뀌지 않은 문단을 {새 문단 인덱스: 이전 문단 인덱스}로 반환합니다."""
+    matcher = difflib.SequenceMatcher(None, old_source_chunks, new_source_chunks, autojunk=False)
+    aligned = {}
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != 'equal':
+            continue
+        for offset in range(i2 - i1):
+            aligned[j1 + offset] = i1 + offset
+    return aligned
+
+
+def carry_reviewed_flags(old_source_chunks: list[str], old_reviewed: list[bool] | None,
+                         new_source_chunks: list[str], reused: dict[int, str]) -> list[bool] | None:
+    """기존 번역의 문단별 검수 여부(.chunks.json의 reviewed)를 새 문단에 옮깁니다.
+
+    기존 번역을 그대로 재사용하는 문단(reused)은 이전 검수 여부를 유지하고, 새로 번역하는 문단은 검수되지
+    않은 것으로 표시합니다. 이전 기록이 없거나 문단 수가 맞지 않으면 None을 반환합니다.
+    """
+    if not old_reviewed or len(old_reviewed) != len(old_source_chunks):
+        return None
+    reviewed = [False] * len(new_source_chunks)
+    for j, i in align_unchanged_chunks(old_source_chunks, new_source_chunks).items():
+        if j in reused:
+            reviewed[j] = bool(old_reviewed[i])
+    return reviewed
+
+
+def _line_count(text: str) -> int:
+    return text.count("\n") + 1
+
+
+def repack_incremental(old_chunks: list[str], old_sections: list[str], new_sections: list[str],
+                       max_tokens: int) -> list[str]:
+    """기존 번역의 문단 경계를 최대한 유지하면서 새 원본의 제목 단위 문단을 토큰 예산에 맞게 묶습니다.
+
+    pack_chunks는 앞에서부터 채워 묶으므로 제목 문단 하나만 커져도 뒤의 경계가 모두 밀려, 다시 묶으면
+    바뀌지 않은 문단의 번역도 재사용할 수 없습니다. 그래서 이전/새 원본을 제목 문단 단위로 정렬해,
+    바뀌지 않은 제목 문단만으로 이루어진 기존 문단(old_chunks)은 경계를 그대로 쓰고 나머지만 다시 묶습니다.
+    old_chunks와 old_sections는 같은 이전 원본을 나눈 것이어야 하며, 경계가 맞지 않으면 새로 묶습니다.
+    """
+    if max_tokens <= 0:
+        return list(new_sections)
+
+    # 기존 문단을 제목 문단 경계에서 끝나는 묶음으로 모읍니다. (큰 제목 문단을 나눈 조각은 한 묶음이 됩니다.)
+    section_ends = {}  # 이전 원본의 누적 줄 수 → 그 줄에서 끝나는 제목 문단 수
+    line = 0
+    for k, section in enumerate(old_sections):
+        line += _line_count(section)
+        section_ends[line] = k + 1
+    groups = []  # (시작 제목 문단, 끝 제목 문단, 기존 문단들)
+    start = line = 0
+    current = []
+    for chunk in old_chunks:
+        line += _line_count(chunk)
+        current.append(chunk)
+        if line in section_ends:
+            groups.append((start, section_ends[line], current))
+            start = section_ends[line]
+            current = []
+    if current or start != len(old_sections):
+        return pack_chunks(new_sections, max_tokens)
+
+    kept = {}  # 새 제목 문단 인덱스 → (끝 제목 문단, 그대로 쓸 기존 문단들)
+    matcher = difflib.SequenceMatcher(None, old_sections, new_sections, autojunk=False)
+    blocks = [opcode for opcode in matcher.get_opcodes() if opcode[0] == 'equal']
+    block = 0
+    for a, b, chunks in groups:
+        while block < len(blocks) and blocks[block][2] <= a:
+            block += 1
+        if block < len(blocks):
+            _, i1, i2, j1, _ = blocks[block]
+            if i1 <= a and b <= i2:
+                kept[j1 + a - i1] = (j1 + b - i1, chunks)
+
+    packed = []
+    pending = []
+    j = 0
+    while j < len(new_sections):
+        if j in kept:
+            packed.extend(pack_chunks(pending, max_tokens))
+            pending = []
+            j, chunks = kept[j]
+            packed.extend(chunks)
+        else:
+            pending.append(new_sections[j])
+            j += 1
+    packed.extend(pack_chunks(pending, max_tokens))
+    return packed
@@ -0,0 +1,176 @@
+"""
+번역을 Streamlit 세션과 분리해 백그라운드에서 실행하는 작업(job) 관리자
+
+화면(세션)은 작업을 제출하고 진행 상황을 주기적으로 읽어 그리기만 하므로, 다른 위젯을 조작하거나
+탭을 닫아도 번역은 계속되고, 여러 사용자·문서의 번역을 한 프로세스에서 동시에 처리할 수 있습니다.
+"""
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+def make_translation_job_id(content_id: str, output_path: str) -> str:
+    """작업 내용 ID(tools.journal.make_job_id)와 출력 경로로 작업 ID를 만듭니다.
+
+    언어별 프롬프트가 같더라도 출력 파일이 다르면 서로 다른 작업으로 구분합니다.
+    """
+    path_id = hashlib.sha256(str(Path(output_path).resolve()).encode('utf-8')).hexdigest()[:8]
+    return f"{content_id}-{path_id}"
+
+
+class TranslationJob:
+    """문서 하나의 번역 작업 상태
+
+    작업 스레드가 ChunkEvent를 반영하고, 화면은 snapshot()으로 그 시점의 상태를 복사해 읽습니다.
+    texts에는 완료된 번역과 스트리밍 중인 부분 번역이 함께 들어 있습니다.
+    """
+
+    def __init__(self, job_id: str, source_chunks: list[str], output_path: str, prompted=(), metrics=None):
+        self.id = job_id
+        self.source_chunks = source_chunks
+        self.output_path = output_path
+        self.prompted = set(prompted)  # LLM으로 번역하는 문단 인덱스 (번역 용어 강조 대상)
+        self.metrics = metrics if metrics is not None else []  # MetricsLog.records를 넘기면 작업 스레드가 채웁니다.
+        self.status = QUEUED
+        self.texts = {}
+        self.completed = set()
+        self.errors = {}
+        self.cached = 0
+        self.error = None  # 문단이 아닌 작업 전체의 오류 메시지
+        self.created_at = time.time()
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+
+    @property
+    def total(self) -> int:
+        return len(self.source_chunks)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    def cancel(self):
+        """작업 취소를 요청합니다. 이미 LLM에 보낸 문단은 끝까지 받아 작업 기록·번역 메모리에 남깁니다."""
+        self._cancel.set()
+
+    def apply(self, event):
+        """ChunkEvent 하나를 작업 상태에 반영합니다."""
+        with self._lock:
+            if event.error is not None:
+                self.errors[event.index] = str(event.error)
+                self.completed.add(event.index)
+                return
+            self.texts[event.index] = event.text
+            if event.done:
+                self.errors.pop(event.index, None)
+                self.completed.add(event.index)
+                self.cached += event.cached
+
+    def result(self) -> list[str]:
+        """문서 순서대로 번역 결과를 반환합니다."""
+        with self._lock:
+            return [self.texts.get(i, "") for i in range(self.total)]
+
+    def snapshot(self) -> dict:
+        """화면에 그릴 현재 상태를 복사해 반환합니다."""
+        with self._lock:
+            return {
+                "id": self.id,
+                "status": self.status,
+                "total": self.total,
+                "completed": len(self.completed),
+                "texts": dict(self.texts),
+                "done": set(self.completed) - set(self.errors),
+                "errors": dict(self.errors),
+                "cached": self.cached,
+                "error": self.error,
+                "metrics": list(self.metrics),
+                "elapsed_s": (self.finished_at or time.time()) - self.created_at,
+            }
+
+    def _finish(self, status: str, error: str | None = None):
+        with self._lock:
+            self.status = status
+            self.error = error
+            self.finished_at = time.time()
+
+
+def run_job(job: TranslationJob, events, on_success=None):
+    """작업 스레드에서 이벤트를 끝까지 소비하며 작업 상태를 갱신합니다.
+
+    모든 문단이 성공하면 on_success(문서 순서의 번역 결과)를 호출해 결과를 저장합니다.
+    """
+    with job._lock:
+        job.status = RUNNING
+    try:
+        for event in events:
+            job.apply(event)
+            if job._cancel.is_set():
+                break
+    except Exception as e:
+        job._finish(FAILED, str(e))
+        return
+    finally:
+        if hasattr(events, "close"):
+            events.close()  # 취소한 경우 아직 시작하지 않은 문단을 취소합니다.
+
+    if job._cancel.is_set():
+        job._finish(CANCELLED)
+    elif job.errors:
+        job._finish(FAILED)
+    else:
+        try:
+            if on_success is not None:
+                on_success(job.result())
+        except Exception as e:
+            job._finish(FAILED, str(e))
+        else:
+            job._finish(DONE)
+
+
+class JobManager:
+    """번역 작업을 최대 max_jobs개까지 동시에 실행하는 프로세스 전역 작업 관리자
+
+    같은 작업 ID(같은 원본·프롬프트·모델·출력 경로)의 작업이 이미 진행 중이면 새로 시작하지 않고 그 작업을 돌려주므로,
+    탭을 다시 열거나 다른 사용자가 같은 문서를 번역해도 중복 요청이 생기지 않습니다.
+    끝난 작업은 최근 keep_finished개만 보관합니다.
+    """
+
+    def __init__(self, max_jobs: int = 4, keep_finished: int = 32):
+        self.keep_finished = keep_finished
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_jobs), thread_name_prefix="translation-job")
+
+    def submit(self, job: TranslationJob, events, on_success=None) -> TranslationJob:
+        """작업을 대기열에 넣고 실제로 실행되는 작업을 반환합니다. events는 아직 시작하지 않은 제너레이터여야 합니다."""
+        with self._lock:
+            existing = self._jobs.get(job.id)
+            if existing is not None and not existing.finished:
+                return existing
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(run_job, job, events, on_success)
+        return job
+
+    def get(self, job_id: str) -> TranslationJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune(self):
+        finished = sorted(
+            (job for job in self._jobs.values() if job.finished),
+            key=lambda job: job.created_at
+        )
+        for job in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job.id]
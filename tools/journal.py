@@ -0,0 +1,94 @@
+"""
+문단 번역 결과를 완료되는 즉시 기록해, 중단된 번역을 이어서 할 수 있게 하는 작업 기록(journal)
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+
+def journal_path(target_path: str) -> Path:
+    """번역 파일의 작업 기록 경로를 반환합니다. (예: mt/models_ko.journal.jsonl)"""
+    path = Path(target_path)
+    return path.with_name(f"{path.stem}.journal.jsonl")
+
+
+def make_job_id(source_chunks: list[str], prompts: dict, model_name: str) -> str:
+    """같은 원본·프롬프트·모델로 다시 시작한 작업을 알아볼 수 있도록 작업 ID를 만듭니다."""
+    payload = json.dumps(
+        [source_chunks, sorted(prompts.items()), model_name],
+        ensure_ascii=False,
+        default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class TranslationJournal:
+    """추가 전용(append-only) JSONL 작업 기록
+
+    각 줄은 {"job", "index", "status", "text" | "error"} 형태이며, 문단 하나가 끝날 때마다
+    기록하고 디스크에 바로 반영합니다. 다른 작업 ID의 기록이 남아 있으면 새로 시작합니다.
+    """
+
+    def __init__(self, target_path: str, job_id: str):
+        self.path = journal_path(target_path)
+        self.job_id = job_id
+        self._lock = threading.Lock()
+        self._completed = {}
+        self._failed = {}
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        stale = False
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # 기록 도중 중단되어 잘린 마지막 줄
+                if record.get("job") != self.job_id:
+                    stale = True
+                    continue
+                index = record["index"]
+                if record["status"] == "ok":
+                    self._completed[index] = record["text"]
+                    self._failed.pop(index, None)
+                else:
+                    self._failed[index] = record["error"]
+        if stale and not self._completed:
+            self.path.unlink()
+
+    def completed(self) -> dict[int, str]:
+        """이미 번역이 끝난 문단을 {문단 인덱스: 번역}으로 반환합니다."""
+        return dict(self._completed)
+
+    def failed(self) -> dict[int, str]:
+        """마지막 시도에서 실패해 다시 번역해야 하는 문단을 {문단 인덱스: 오류 메시지}로 반환합니다."""
+        return dict(self._failed)
+
+    def _append(self, record: dict):
+        record["job"] = self.job_id
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def record_success(self, index: int, text: str):
+        self._append({"index": index, "status": "ok", "text": text})
+        self._completed[index] = text
+        self._failed.pop(index, None)
+
+    def record_failure(self, index: int, error: Exception | str):
+        self._append({"index": index, "status": "error", "error": str(error)})
+        self._failed[index] = str(error)
+
+    def clear(self):
+        """최종 번역 파일을 저장한 뒤 작업 기록을 삭제합니다."""
+        with self._lock:
+            self.path.unlink(missing_ok=True)
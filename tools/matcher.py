@@ -0,0 +1,265 @@
+"""
+단어사전 용어를 한 번에 찾는 트라이(trie) 기반 다중 패턴 매처
+"""
+import base64
+import sys
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+
+HIGHLIGHT_TEMPLATE = '<span style="color: blue; font-weight: bold;">{}</span>'
+
+_TERMINAL = None  # 트라이 노드에서 용어가 끝났음을 나타내는 키
+
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
+def _fold(text: str) -> str:
+    """대소문자를 무시하고 비교하기 위해 글자 단위로 소문자화합니다.
+
+    소문자화로 길이가 바뀌는 글자(예: 'İ')는 원문 위치를 유지하도록 바꾸지 않습니다.
+    """
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+def _encode_ints(values) -> str:
+    data = array('I', values)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return base64.b64encode(data.tobytes()).decode('ascii')
+
+
+def _decode_ints(text: str) -> array:
+    data = array('I')
+    data.frombytes(base64.b64decode(text))
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data
+
+
+class TermMatcher:
+    """용어 목록으로 트라이를 한 번 만들어 두고, 텍스트를 한 번 훑으며 용어를 찾습니다.
+
+    같은 위치에서는 가장 긴 용어를, 겹치는 경우에는 먼저 시작하는 용어를 선택합니다.
+    (길이순으로 정렬한 정규식 alternation과 같은 결과)
+
+    트라이 노드는 {글자: 자식 노드, _TERMINAL: 값} 딕셔너리입니다. to_data()로 저장한 매처를 from_data()로
+    읽으면 자식 노드가 아직 딕셔너리로 만들지 않은 노드 번호(int)로 남아 있다가, 검색 중 처음 지날 때 만들어집니다.
+    (수백만 개의 노드를 읽을 때 한꺼번에 만들지 않기 위해서입니다.)
+    """
+
+    def __init__(self, terms, values=None):
+        self.root = {}
+        self._flat = None
+        if values is None:
+            values = terms
+        for term, value in zip(terms, values):
+            if not term:
+                continue
+            node = self.root
+            for key in _fold(term):
+                node = node.setdefault(key, {})
+            # 대소문자만 다른 중복 용어는 먼저 나온 것을 사용합니다.
+            node.setdefault(_TERMINAL, value)
+
+    def to_data(self) -> dict:
+        """트라이를 너비 우선 순서로 펼쳐 JSON으로 저장할 수 있는 데이터로 만듭니다.
+
+        노드 k로 들어오는 글자는 chars[k]이고, 노드 k의 자식은 노드 first[k]부터 first[k + 1] - 1까지입니다.
+        """
+        chars = ["\0"]  # 루트 노드로 들어오는 글자는 없습니다.
+        first = []
+        terminals = []
+        values = []
+        queue = [self.root]
+        i = 0
+        while i < len(queue):
+            node = queue[i]
+            first.append(len(queue))
+            for key, child in node.items():
+                if key is _TERMINAL:
+                    terminals.append(i)
+                    values.append(child)
+                    continue
+                if child.__class__ is int:
+                    child = node[key] = self._expand(child)
+                chars.append(key)
+                queue.append(child)
+            i += 1
+        first.append(len(queue))
+        data = {
+            "chars": "".join(chars),
+            "first": _encode_ints(first),
+            "terminals": _encode_ints(terminals),
+        }
+        if all(value.__class__ is int and value >= 0 for value in values):
+            data["int_values"] = _encode_ints(values)  # 단어사전 항목 인덱스 등은 배열로 저장합니다.
+        else:
+            data["values"] = values
+        return data
+
+    @classmethod
+    def from_data(cls, data: dict) -> "TermMatcher":
+        """to_data()로 만든 데이터에서 매처를 만듭니다. 노드는 검색 중 필요할 때 만듭니다."""
+        matcher = cls(())
+        values = _decode_ints(data["int_values"]) if "int_values" in data else data["values"]
+        matcher._flat = (data["chars"], _decode_ints(data["first"]), _decode_ints(data["terminals"]), values)
+        matcher.root = matcher._expand(0)
+        return matcher
+
+    def _expand(self, node_id: int) -> dict:
+        chars, first, terminals, values = self._flat
+        start, end = first[node_id], first[node_id + 1]
+        node = dict(zip(chars[start:end], range(start, end)))
+        k = bisect_left(terminals, node_id)
+        if k < len(terminals) and terminals[k] == node_id:
+            node[_TERMINAL] = values[k]
+        return node
+
+    def find_all(self, text: str, skip_code: bool = True):
+        """텍스트에서 찾은 용어를 (시작, 끝, 값) 형태로 차례대로 생성합니다.
+
+        skip_code가 True이면 코드 블록(```...```)과 인라인 코드(`...`) 안은 건너뜁니다.
+        """
+        root = self.root
+        if not root:
+            return
+        folded = _fold(text)
+        length = len(text)
+        i = 0
+        while i < length:
+            if skip_code and text[i] == '`':
+                if text.startswith('```', i):
+                    close = text.find('```', i + 3)
+                    if close != -1:
+                        i = close + 3
+                        continue
+                close = text.find('`', i + 1)
+                if close != -1:
+                    i = close + 1
+                    continue
+
+            node = root.get(folded[i])
+            if node is None:
+                i += 1
+                continue
+            if node.__class__ is int:
+                node = root[folded[i]] = self._expand(node)
+
+            match_end = -1
+            match_value = None
+            j = i + 1
+            while True:
+                if _TERMINAL in node:
+                    match_end = j
+                    match_value = node[_TERMINAL]
+                if j >= length:
+                    break
+                parent = node
+                node = node.get(folded[j])
+                if node is None:
+                    break
+                if node.__class__ is int:
+                    node = parent[folded[j]] = self._expand(node)
+                j += 1
+
+            if match_end == -1:
+                i += 1
+            else:
+                yield i, match_end, match_value
+                i = match_end
+
+    def find_values(self, text: str, skip_code: bool = True, whole_words: bool = False) -> set:
+        """텍스트에 나온 모든 용어의 값을 반환합니다.
+
+        find_all과 달리 긴 용어 안에 든 짧은 용어('언어 모델' 안의 '모델')나 겹치는 용어도 모두 찾습니다.
+        whole_words가 True이면 단어 중간에 걸친 용어('Rapid' 안의 'API' 등)는 찾지 않습니다.
+        """
+        root = self.root
+        found = set()
+        if not root:
+            return found
+        folded = _fold(text)
+        length = len(text)
+        i = 0
+        while i < length:
+            if skip_code and text[i] == '`':
+                if text.startswith('```', i):
+                    close = text.find('```', i + 3)
+                    if close != -1:
+                        i = close + 3
+                        continue
+                close = text.find('`', i + 1)
+                if close != -1:
+                    i = close + 1
+                    continue
+
+            if whole_words and i > 0 and _is_word_char(text[i - 1]) and _is_word_char(text[i]):
+                i += 1
+                continue
+            node = root.get(folded[i])
+            if node.__class__ is int:
+                node = root[folded[i]] = self._expand(node)
+            j = i + 1
+            while node is not None:
+                if _TERMINAL in node and not (
+                    whole_words and j < length and _is_word_char(text[j - 1]) and _is_word_char(text[j])
+                ):
+                    found.add(node[_TERMINAL])
+                if j >= length:
+                    break
+                parent = node
+                node = node.get(folded[j])
+                if node.__class__ is int:
+                    node = parent[folded[j]] = self._expand(node)
+                j += 1
+            i += 1
+        return found
+
+    def highlight(self, text: str, template: str = HIGHLIGHT_TEMPLATE) -> str:
+        """찾은 용어를 template으로 감싼 텍스트를 반환합니다. 코드 블록과 인라인 코드는 제외합니다."""
+        parts = []
+        last = 0
+        for start, end, _ in self.find_all(text):
+            parts.append(text[last:start])
+            parts.append(template.format(text[start:end]))
+            last = end
+        if not parts:
+            return text
+        parts.append(text[last:])
+        return "".join(parts)
+
+
+@lru_cache(maxsize=32)
+def _cached_term_matcher(terms: tuple) -> TermMatcher:
+    return TermMatcher(terms)
+
+
+# 용어 리스트 객체 자체로 매처를 찾기 위한 등록부 {id(리스트): (리스트, 매처를 반환하는 함수)}
+_registered_matchers = {}
+_MAX_REGISTERED = 16
+
+
+def register_term_matcher(terms: list, matcher_factory):
+    """용어 리스트에 대한 매처를 반환하는 함수를 등록합니다.
+
+    등록된 리스트로 강조할 때는 튜플 변환·해시 없이 바로 매처를 찾습니다. (컴파일된 단어사전에서 사용)
+    """
+    if len(_registered_matchers) >= _MAX_REGISTERED:
+        _registered_matchers.pop(next(iter(_registered_matchers)))
+    _registered_matchers[id(terms)] = (terms, matcher_factory)
+
+
+def get_term_matcher(terms) -> TermMatcher:
+    """용어 목록에 대한 매처를 반환합니다. 같은 용어 목록(단어사전 버전)이면 캐시된 매처를 재사용합니다."""
+    if isinstance(terms, TermMatcher):
+        return terms
+    registered = _registered_matchers.get(id(terms))
+    if registered is not None and registered[0] is terms:
+        return registered[1]()
+    return _cached_term_matcher(tuple(terms))
@@ -0,0 +1,136 @@
+"""
+문단별 LLM 요청의 지연시간·토큰·비용을 기록하고 요약하는 도구
+"""
+import json
+import threading
+import time
+from pathlib import Path
+from tools.tokens import estimate_tokens, prompt_to_text
+
+
+def estimate_cost(model_name: str, input_tokens: int, output_tokens: int,
+                  cache_read_tokens: int = 0, cache_creation_tokens: int = 0) -> float | None:
+    """LiteLLM의 모델 가격표로 요청 비용(USD)을 추정합니다. 가격을 모르는 모델이면 None을 반환합니다.
+
+    프롬프트 캐시에서 읽은/캐시에 쓴 토큰 수를 넘기면 캐시 가격을 반영합니다.
+    """
+    try:
+        import litellm
+        kwargs = {}
+        if cache_read_tokens or cache_creation_tokens:
+            kwargs = {
+                "cache_read_input_tokens": cache_read_tokens,
+                "cache_creation_input_tokens": cache_creation_tokens,
+            }
+        try:
+            prompt_cost, completion_cost = litellm.cost_per_token(
+                model=model_name,
+                prompt_tokens=input_tokens,
+                completion_tokens=output_tokens,
+                **kwargs
+            )
+        except TypeError:
+            # 캐시 토큰 인자를 지원하지 않는 이전 버전의 LiteLLM
+            prompt_cost, completion_cost = litellm.cost_per_token(
+                model=model_name,
+                prompt_tokens=input_tokens,
+                completion_tokens=output_tokens
+            )
+        return prompt_cost + completion_cost
+    except Exception:
+        return None
+
+
+def build_chunk_metrics(event, prompt, model_name: str) -> dict:
+    """완료 이벤트의 요청 통계로 기록할 지표를 만듭니다.
+
+    제공자가 토큰 사용량을 보고하지 않으면 입력/출력 토큰 수를 추정값으로 채웁니다.
+    """
+    stats = event.stats or {}
+    usage = stats.get("usage") or {}
+    input_tokens = usage.get("input_tokens") or estimate_tokens(prompt_to_text(prompt))
+    output_tokens = usage.get("output_tokens") or estimate_tokens(event.text)
+    # 프롬프트 캐시에서 읽은/캐시에 새로 쓴 입력 토큰 수 (제공자가 보고한 경우에만)
+    cache_details = usage.get("input_token_details") or {}
+    cache_read = cache_details.get("cache_read") or 0
+    cache_creation = cache_details.get("cache_creation") or 0
+    latency = stats.get("latency_s") or 0.0
+    ttft = stats.get("ttft_s")
+    generation_time = latency - (ttft or 0.0)
+    return {
+        "index": event.index,
+        "status": "error" if event.error is not None else "ok",
+        "error": str(event.error) if event.error is not None else None,
+        "error_kind": stats.get("error_kind"),
+        "attempts": stats.get("attempts", 1),
+        "throttled": stats.get("throttled", 0),
+        "ttft_s": ttft,
+        "latency_s": latency,
+        "tokens_per_s": output_tokens / generation_time if generation_time > 0 else None,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cache_read_tokens": cache_read,
+        "cache_creation_tokens": cache_creation,
+        "usage_reported": bool(usage),
+        "cost_usd": estimate_cost(model_name, input_tokens, output_tokens, cache_read, cache_creation),
+    }
+
+
+class MetricsLog:
+    """한 번의 번역 실행에서 나온 문단별 지표를 JSONL 파일에 추가하고 메모리에도 보관합니다.
+
+    context(모델 이름, 단어사전 크기, 문서 경로 등)는 모든 기록에 함께 저장됩니다.
+    """
+
+    def __init__(self, path: str | None, **context):
+        self.path = Path(path) if path else None
+        self.context = {"run_id": time.strftime("%Y%m%d-%H%M%S"), **context}
+        self.records = []
+        self._lock = threading.Lock()
+
+    def bind(self, **context) -> "MetricsLog":
+        """같은 파일과 기록 목록을 공유하면서 context만 추가한 기록기를 반환합니다. (문서별 기록 등)"""
+        child = MetricsLog.__new__(MetricsLog)
+        child.path = self.path
+        child.context = {**self.context, **context}
+        child.records = self.records
+        child._lock = self._lock
+        return child
+
+    def record(self, metrics: dict):
+        record = {"timestamp": time.time(), **self.context, **metrics}
+        with self._lock:
+            self.records.append(record)
+            if self.path is not None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def summarize_metrics(records: list[dict]) -> dict:
+    """문단별 지표를 실행 단위로 요약합니다."""
+    ok = [r for r in records if r["status"] == "ok"]
+    ttfts = [r["ttft_s"] for r in ok if r["ttft_s"] is not None]
+    rates = [r["tokens_per_s"] for r in ok if r["tokens_per_s"] is not None]
+    costs = [r["cost_usd"] for r in records if r["cost_usd"] is not None]
+    latencies = sorted(r["latency_s"] for r in ok)
+    # 캐시 적중률은 제공자가 사용량을 보고한 요청의 입력 토큰 중 캐시에서 읽은 비율입니다.
+    reported = [r for r in ok if r.get("usage_reported")]
+    reported_input = sum(r["input_tokens"] for r in reported)
+    cache_read = sum(r.get("cache_read_tokens", 0) for r in reported)
+    return {
+        "requests": len(records),
+        "errors": len(records) - len(ok),
+        "retries": sum(r.get("attempts", 1) - 1 for r in records),
+        "throttled": sum(r.get("throttled", 0) for r in records),
+        "input_tokens": sum(r["input_tokens"] for r in records),
+        "output_tokens": sum(r["output_tokens"] for r in records),
+        "avg_ttft_s": sum(ttfts) / len(ttfts) if ttfts else None,
+        "p95_latency_s": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else None,
+        "avg_tokens_per_s": sum(rates) / len(rates) if rates else None,
+        "cache_read_tokens": cache_read,
+        "cache_creation_tokens": sum(r.get("cache_creation_tokens", 0) for r in reported),
+        "cache_hit_requests": sum(1 for r in reported if r.get("cache_read_tokens")),
+        "cache_hit_rate": cache_read / reported_input if reported_input else None,
+        "cost_usd": sum(costs) if costs else None,
+    }
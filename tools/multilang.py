@@ -0,0 +1,88 @@
+"""
+원본을 한 번만 나눠 여러 언어로 동시에 번역하는 도구
+"""
+import queue
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from tools.pipeline import translate_document
+
+
+def parse_languages(value: str) -> list[str]:
+    """'ja, zh-CN' 같은 쉼표 구분 문자열을 중복 없는 언어 코드 리스트로 바꿉니다."""
+    languages = []
+    for lang in value.split(","):
+        lang = lang.strip()
+        if lang and lang not in languages:
+            languages.append(lang)
+    return languages
+
+
+def language_path(template: str, lang: str) -> str:
+    """경로 템플릿의 {lang}을 언어 코드로 바꿉니다. (예: prompts/nmt_{lang}.yaml → prompts/nmt_ja.yaml)"""
+    return template.replace("{lang}", lang)
+
+
+def language_output_path(output_dir: str, source_path: str, lang: str) -> Path:
+    """언어별 번역 파일 경로를 반환합니다. (예: mt + source_docs/models.md + ja → mt/ja/models_ja.md)"""
+    source = Path(source_path)
+    return Path(output_dir) / lang / f"{source.stem}_{lang}{source.suffix}"
+
+
+@dataclass
+class LanguageTarget:
+    """한 언어의 번역에 필요한 문단별 프롬프트와 언어별 저장소"""
+    prompts: dict
+    placeholders: dict = field(default_factory=dict)
+    reused: dict = field(default_factory=dict)
+    glossary_version: str = ""
+    journal: object = None
+    metrics_log: object = None
+
+
+def translate_languages(llm, source_chunks: list[str], targets: dict, **options):
+    """같은 원본 문단을 언어마다 동시에 번역하며 (언어, ChunkEvent)를 도착한 순서대로 생성합니다.
+
+    targets는 {언어 코드: LanguageTarget}이며, options(model_name, tm, limiter, max_workers, max_retries 등)는
+    모든 언어가 함께 씁니다. 같은 limiter를 넘기면 언어를 합친 동시 요청 수가 제공자 한도에 맞춰 조절되고,
+    번역 메모리 키에는 프롬프트가 들어가므로 언어별 결과가 섞이지 않습니다.
+    """
+    events = queue.Queue()
+    stop = threading.Event()
+
+    def pump(lang, target):
+        document_events = translate_document(
+            llm, source_chunks, target.prompts,
+            glossary_version=target.glossary_version,
+            journal=target.journal,
+            metrics_log=target.metrics_log,
+            placeholders=target.placeholders,
+            reused=target.reused,
+            **options
+        )
+        try:
+            for event in document_events:
+                events.put((lang, event))
+                if stop.is_set():
+                    break
+        except Exception as e:
+            events.put((lang, e))
+        finally:
+            document_events.close()  # 소비자가 멈춘 경우 아직 시작하지 않은 문단을 취소합니다.
+            events.put((lang, None))
+
+    for lang, target in targets.items():
+        threading.Thread(target=pump, args=(lang, target), daemon=True, name=f"translate-{lang}").start()
+
+    try:
+        remaining = len(targets)
+        while remaining:
+            lang, event = events.get()
+            if event is None:
+                remaining -= 1
+            elif isinstance(event, Exception):
+                raise event
+            else:
+                yield lang, event
+    finally:
+        stop.set()
@@ -0,0 +1,182 @@
+"""
+문서 한 개를 번역하는 공통 파이프라인 (Streamlit UI와 명령줄 도구에서 함께 사용)
+"""
+from tools.chunking import save_chunk_layout
+from tools.engine import ChunkEvent, translate_chunks
+from tools.fileio import write_text_atomic
+from tools.fuzzy_memory import reference_instruction
+from tools.glossary import select_glossary_entries
+from tools.incremental import save_source_snapshot
+from tools.metrics import build_chunk_metrics
+from tools.placeholders import (
+    PLACEHOLDER_INSTRUCTION,
+    PlaceholderError,
+    has_translatable_text,
+    protect_markdown,
+    restore_markdown
+)
+from tools.translation_memory import make_cache_key
+from tools.utils import prepare_final_prompt
+
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def supports_cache_control(model_name: str) -> bool:
+    """프롬프트에 캐시 지점(cache_control)을 표시해야 하는 모델인지 LiteLLM 모델 정보로 확인합니다.
+
+    Claude 모델은 표시한 지점까지의 접두부만 캐시하고, OpenAI 등은 표시 없이 같은 접두부를 자동으로 캐시합니다.
+    """
+    if "claude" not in model_name.lower():
+        return False
+    try:
+        import litellm
+        return bool(litellm.supports_prompt_caching(model=model_name))
+    except Exception:
+        return False
+
+
+def split_prompt(prompt_template: str, chunk: str, cache_control: bool = False) -> list[dict] | str:
+    """프롬프트를 문단마다 같은 접두부(시스템 메시지)와 문단별 부분(사용자 메시지)으로 나눕니다.
+
+    제공자는 요청 사이에 같은 접두부를 캐시해 다시 처리하지 않으므로, 단어사전과 지시문이 담긴 긴 접두부의
+    입력 비용과 첫 토큰 지연이 줄어듭니다. cache_control이 True이면 접두부 끝에 캐시 지점을 표시합니다.
+    템플릿에 {source} 앞부분이 없으면 나누지 않고 문자열 프롬프트를 반환합니다.
+    """
+    prefix, sep, suffix = prompt_template.partition("{source}")
+    if not sep or not prefix.strip():
+        return prompt_template.replace("{source}", chunk)
+    system = {"type": "text", "text": prefix}
+    if cache_control:
+        system["cache_control"] = CACHE_CONTROL
+    return [
+        {"role": "system", "content": [system]},
+        {"role": "user", "content": chunk + suffix},
+    ]
+
+
+def _append_instruction(prompt, instruction: str):
+    if isinstance(prompt, str):
+        return prompt + instruction
+    prompt[-1]["content"] += instruction
+    return prompt
+
+
+def build_chunk_prompts(source_chunks: list[str], base_prompt: str, glossary_data: list,
+                        prune_glossary: bool = False, protect=(), cache_prefix: bool = False,
+                        cache_control: bool = False, references: dict | None = None) -> tuple[dict[int, str | list], dict[int, dict]]:
+    """비어 있지 않은 문단마다 최종 프롬프트를 만들어 ({문단 인덱스: 프롬프트}, {문단 인덱스: 자리표시자 매핑})을 반환합니다.
+
+    protect에 tools.placeholders의 요소(코드 블록, 인라인 코드, URL)를 지정하면 해당 부분을 자리표시자로 바꿔
+    LLM에 보내지 않습니다. 자리표시자를 빼면 번역할 내용이 없는 문단(코드만 있는 문단 등)은 프롬프트를 만들지 않습니다.
+    cache_prefix가 True이면 프롬프트를 split_prompt로 나눈 메시지 리스트로 만듭니다. (프롬프트 캐싱)
+    문단별 단어사전 필터링을 함께 쓰면 문단마다 접두부가 달라져 캐시에서 읽을 수 없으므로, 캐시 쓰기 요금만
+    더 내지 않도록 cache_control을 무시합니다.
+    references({문단 인덱스: tools.fuzzy_memory.FuzzyMatch})가 있으면 비슷한 검수 번역을 문단별 부분 끝에
+    참고 번역으로 붙입니다. (캐시되는 접두부는 바뀌지 않습니다.)
+    """
+    references = references or {}
+    cache_control = cache_control and not prune_glossary
+    final_prompt_template = prepare_final_prompt(base_prompt, glossary_data)
+    prompts = {}
+    placeholders = {}
+    for i, chunk in enumerate(source_chunks):
+        if not chunk.strip():
+            continue
+        mapping = {}
+        if protect:
+            chunk, mapping = protect_markdown(chunk, protect)
+            if not has_translatable_text(chunk):
+                continue
+        if prune_glossary:
+            template = prepare_final_prompt(base_prompt, select_glossary_entries(chunk, glossary_data))
+        else:
+            template = final_prompt_template
+        if cache_prefix:
+            prompts[i] = split_prompt(template, chunk, cache_control)
+        else:
+            prompts[i] = template.replace("{source}", chunk)
+        if mapping:
+            prompts[i] = _append_instruction(prompts[i], PLACEHOLDER_INSTRUCTION)
+            placeholders[i] = mapping
+        if i in references:
+            prompts[i] = _append_instruction(prompts[i], reference_instruction(references[i], protect))
+    return prompts, placeholders
+
+
+def translate_document(llm, source_chunks: list[str], prompts: dict, model_name: str = "",
+                       glossary_version: str = "", tm=None, reused: dict | None = None,
+                       max_workers: int = 4, limiter=None, journal=None, metrics_log=None,
+                       max_retries: int = 0, placeholders: dict | None = None):
+    """문서의 모든 문단에 대한 ChunkEvent를 생성합니다.
+
+    빈 문단(prompts에 없는 문단), 재사용할 기존 번역(reused), 작업 기록(journal)에 이미 완료된 문단,
+    번역 메모리에 있는 문단은 LLM을 호출하지 않고 곧바로 완료 이벤트를 만들고, 나머지만 동시에 번역합니다.
+    새로 번역된 문단은 끝나는 즉시 작업 기록과 번역 메모리에 저장하고, 실패한 문단은 재시도 대상으로 기록합니다.
+    metrics_log(MetricsLog)를 넘기면 LLM을 호출한 문단마다 지연시간·토큰·비용 지표를 기록합니다.
+    placeholders(build_chunk_prompts의 두 번째 반환값)가 있으면 번역 결과의 자리표시자를 원문으로 되돌리고,
+    빠진 자리표시자가 있는 문단은 실패로 처리합니다.
+    """
+    reused = reused or {}
+    placeholders = placeholders or {}
+    resumed = journal.completed() if journal else {}
+    cache_keys = {}
+    pending = {}
+    for i, chunk in enumerate(source_chunks):
+        if i in reused:
+            yield ChunkEvent(i, reused[i], done=True)
+        elif i not in prompts:
+            yield ChunkEvent(i, chunk, done=True)
+        elif i in resumed:
+            yield ChunkEvent(i, resumed[i], done=True)
+        else:
+            cache_keys[i] = make_cache_key(chunk, prompts[i], glossary_version, model_name)
+            cached = tm.get(cache_keys[i]) if tm else None
+            if cached is not None:
+                yield ChunkEvent(i, cached, done=True, cached=True)
+            else:
+                pending[i] = prompts[i]
+
+    def on_complete(event):
+        if event.error is None and event.index in placeholders:
+            restored, problems = restore_markdown(event.text, placeholders[event.index])
+            if problems:
+                event.error = PlaceholderError(f"번역 결과의 자리표시자가 원문과 다릅니다: {', '.join(problems)}")
+            else:
+                event.text = restored
+        if metrics_log is not None:
+            metrics_log.record(build_chunk_metrics(event, pending[event.index], model_name))
+        if event.error is not None:
+            if journal:
+                journal.record_failure(event.index, event.error)
+            return
+        if journal:
+            journal.record_success(event.index, event.text)
+        if tm and event.text.strip():
+            tm.put(cache_keys[event.index], event.text, model_name)
+
+    events = translate_chunks(
+        llm, pending,
+        max_workers=max_workers,
+        limiter=limiter,
+        on_complete=on_complete,
+        max_retries=max_retries
+    )
+    for event in events:
+        # 스트리밍 중인 번역도 자리표시자를 원문으로 바꿔 보여줍니다.
+        if not event.done and event.index in placeholders:
+            event.text = restore_markdown(event.text, placeholders[event.index])[0]
+        yield event
+
+
+def save_translation_result(output_path: str, source_chunks: list[str], final_chunks: list[str], journal=None,
+                            reviewed: list[bool] | None = None):
+    """번역 결과를 저장하고 원본 스냅샷·문단 배치 정보를 함께 남긴 뒤, 작업 기록을 지웁니다.
+
+    reviewed(문단별 검수 여부, tools.incremental.carry_reviewed_flags 참고)를 넘기면 문단 배치 정보에 함께 기록합니다.
+    """
+    write_text_atomic(output_path, "\n".join(final_chunks))
+    save_source_snapshot(output_path, source_chunks)
+    save_chunk_layout(output_path, source_chunks, final_chunks, reviewed)
+    if journal:
+        journal.clear()
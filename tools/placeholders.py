@@ -0,0 +1,99 @@
+"""
+코드 블록·인라인 코드·URL을 자리표시자로 바꿔 LLM에 보내지 않고, 번역 후 그대로 되돌리는 도구
+"""
+import re
+from collections import Counter
+from tools.splitter import fence_state
+
+CODE_BLOCKS = "code"
+INLINE_CODE = "inline"
+URLS = "url"
+
+PLACEHOLDER_INSTRUCTION = (
+    "\n\n(@@CODEn@@, @@URLn@@ 처럼 @@로 감싼 자리표시자는 번역하거나 수정하지 말고 같은 위치에 그대로 유지하세요.)"
+)
+
+_INLINE_CODE = re.compile(r"(`+)(?!`)(.+?)(?<!`)\1(?!`)")
+_LINK_TARGET = re.compile(r"(\]\()([^)\s]+)")
+_BARE_URL = re.compile(r"https?://[^\s<>()\[\]`]+")
+_PLACEHOLDER = re.compile(r"@@(?:CODE|URL)\d+@@")
+
+
+class PlaceholderError(ValueError):
+    """번역 결과에서 자리표시자가 사라졌거나 바뀐 경우"""
+
+
+def _mask_code_blocks(text: str, mapping: dict) -> str:
+    # 분할기와 같은 기준(tools.splitter.fence_state)으로 코드 블록을 찾으므로 목록 안의 들여쓴 펜스도 가립니다.
+    result = []
+    block = []
+    fence = None
+    for line in text.split("\n"):
+        next_fence = fence_state(fence, line)
+        if fence is None:
+            if next_fence is None:
+                result.append(line)
+            else:
+                block = [line]
+        else:
+            block.append(line)
+            if next_fence is None:
+                placeholder = f"@@CODE{len(mapping)}@@"
+                mapping[placeholder] = "\n".join(block)
+                result.append(placeholder)
+        fence = next_fence
+    if fence is not None:
+        # 닫히지 않은 코드 블록은 문단 끝까지 코드로 봅니다.
+        placeholder = f"@@CODE{len(mapping)}@@"
+        mapping[placeholder] = "\n".join(block)
+        result.append(placeholder)
+    return "\n".join(result)
+
+
+def _mask_pattern(text: str, pattern: re.Pattern, mapping: dict, kind: str, group: int = 0) -> str:
+    def replace(match):
+        if _PLACEHOLDER.fullmatch(match.group(group)):
+            return match.group(0)
+        placeholder = f"@@{kind}{len(mapping)}@@"
+        mapping[placeholder] = match.group(group)
+        if group == 0:
+            return placeholder
+        start, end = match.span(group)
+        whole_start = match.start(0)
+        whole = match.group(0)
+        return whole[:start - whole_start] + placeholder + whole[end - whole_start:]
+    return pattern.sub(replace, text)
+
+
+def protect_markdown(text: str, kinds=(CODE_BLOCKS,)) -> tuple[str, dict]:
+    """선택한 요소(kinds)를 자리표시자로 바꾼 텍스트와 {자리표시자: 원문} 매핑을 반환합니다."""
+    mapping = {}
+    if CODE_BLOCKS in kinds:
+        text = _mask_code_blocks(text, mapping)
+    if INLINE_CODE in kinds:
+        text = _mask_pattern(text, _INLINE_CODE, mapping, "CODE")
+    if URLS in kinds:
+        text = _mask_pattern(text, _LINK_TARGET, mapping, "URL", group=2)
+        text = _mask_pattern(text, _BARE_URL, mapping, "URL")
+    return text, mapping
+
+
+def restore_markdown(text: str, mapping: dict) -> tuple[str, list[str]]:
+    """자리표시자를 원문으로 되돌리고, 번역 결과에서 어긋난 자리표시자 목록을 함께 반환합니다.
+
+    매핑의 자리표시자가 정확히 한 번씩 나오고 매핑에 없는 자리표시자가 없어야 목록이 비어 있습니다.
+    (빠지거나 두 번 나온 코드 블록이 그대로 저장되지 않도록)
+    """
+    counts = Counter(_PLACEHOLDER.findall(text))
+    problems = [
+        f"{placeholder} 빠짐" if not counts[placeholder] else f"{placeholder} {counts[placeholder]}번"
+        for placeholder in mapping if counts[placeholder] != 1
+    ]
+    problems.extend(f"{placeholder} 원문에 없음" for placeholder in counts if placeholder not in mapping)
+    restored = _PLACEHOLDER.sub(lambda m: mapping.get(m.group(0), m.group(0)), text)
+    return restored, problems
+
+
+def has_translatable_text(masked: str) -> bool:
+    """자리표시자를 제외하고 번역할 내용이 남아 있으면 True를 반환합니다."""
+    return bool(_PLACEHOLDER.sub("", masked).strip())
@@ -0,0 +1,148 @@
+"""
+LLM 요청 오류 분류, 지수 백오프 재시도, AIMD 방식의 동시 요청 수 조절
+"""
+import email.utils
+import random
+import threading
+import time
+
+RATE_LIMITED = "rate_limited"
+OVERLOADED = "overloaded"
+TRANSIENT = "transient"
+FATAL = "fatal"
+
+RETRYABLE = {RATE_LIMITED, OVERLOADED, TRANSIENT}
+
+
+def _status_code(error) -> int | None:
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(error: Exception) -> str:
+    """LLM 요청 오류를 사용량 제한 / 과부하 / 일시적 오류 / 재시도 불가 오류로 분류합니다."""
+    status = _status_code(error)
+    name = type(error).__name__
+    message = str(error).lower()
+    if status == 429 or "ratelimit" in name.lower() or "rate limit" in message:
+        return RATE_LIMITED
+    if status in (503, 529) or "overloaded" in name.lower() or "overloaded" in message:
+        return OVERLOADED
+    if status in (408, 409, 500, 502, 504) or isinstance(error, (TimeoutError, ConnectionError)):
+        return TRANSIENT
+    if any(key in name for key in ("Timeout", "APIConnectionError", "InternalServerError", "ServiceUnavailable")):
+        return TRANSIENT
+    return FATAL
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    """오류에 담긴 Retry-After 값(초)을 반환합니다. 없으면 None을 반환합니다."""
+    value = getattr(error, "retry_after", None)
+    if value is None:
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        try:
+            if headers.get("retry-after-ms") is not None:
+                return float(headers["retry-after-ms"]) / 1000
+            value = headers.get("retry-after")
+        except AttributeError:
+            return None
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    # HTTP 날짜 형식 (예: "Wed, 21 Oct 2015 07:28:00 GMT")
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value).timestamp()
+        return max(0.0, retry_at - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """재시도 대기 시간을 지수 백오프 + 전체 지터(full jitter) 방식으로 계산합니다."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class AdaptiveLimiter:
+    """AIMD(가산 증가, 승법 감소) 방식으로 동시 요청 수를 조절하는 세마포어
+
+    요청이 성공할 때마다 동시 요청 한도를 조금씩(한도당 +1) 늘리고, 사용량 제한·과부하 응답을 받으면
+    절반으로 줄입니다. 동시에 들어온 여러 개의 429 응답에 한도가 연달아 줄지 않도록 감소는
+    cooldown초에 한 번만 적용합니다. Retry-After를 받으면 그 시간 동안 새 요청을 보내지 않습니다.
+    """
+
+    def __init__(self, max_concurrency: int, initial: int | None = None,
+                 min_concurrency: int = 1, cooldown: float = 2.0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = float(min(initial or self.max_concurrency, self.max_concurrency))
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def set_max_concurrency(self, max_concurrency: int):
+        """동시 요청 한도의 상한을 바꿉니다.
+
+        사용량 제한으로 줄여 둔 한도는 새 상한을 넘지 않는 한 그대로 두고, 상한까지 올라가 있던 한도는 새 상한으로 맞춥니다.
+        이미 보낸 요청은 그대로 진행합니다.
+        """
+        max_concurrency = max(1, max_concurrency)
+        with self._cond:
+            if max_concurrency == self.max_concurrency:
+                return
+            if self.limit >= self.max_concurrency or self.limit > max_concurrency:
+                self.limit = float(max_concurrency)
+            self.max_concurrency = max_concurrency
+            self.min_concurrency = min(self.min_concurrency, max_concurrency)
+            self._cond.notify_all()
+
+    def acquire(self):
+        with self._cond:
+            while True:
+                wait = self._paused_until - time.monotonic()
+                if wait <= 0 and self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                self._cond.wait(timeout=wait if wait > 0 else None)
+
+    def release(self):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self):
+        with self._cond:
+            self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def on_throttle(self, retry_after: float | None = None):
+        now = time.monotonic()
+        with self._cond:
+            if now - self._last_decrease >= self.cooldown:
+                self.limit = max(self.min_concurrency, self.limit / 2)
+                self._last_decrease = now
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+            self._cond.notify_all()
+
+
+def provider_of(model_name: str) -> str:
+    """모델 이름에서 제공자를 추정합니다. 제공자별로 동시 요청 한도를 따로 조절하는 데 사용합니다."""
+    if "/" in model_name:
+        return model_name.split("/", 1)[0]
+    if "claude" in model_name:
+        return "anthropic"
+    if "gpt" in model_name or model_name.startswith(("o1", "o3", "o4")):
+        return "openai"
+    if "gemini" in model_name:
+        return "gemini"
+    return model_name
@@ -0,0 +1,124 @@
+"""
+큰 마크다운 문서도 한 줄씩 읽으며 제목(#) 기준으로 나누는 스트리밍 분할기
+"""
+import re
+from dataclasses import dataclass
+from itertools import chain
+from typing import Iterable, Iterator
+
+# CommonMark 코드 펜스: 백틱(`) 또는 물결표(~) 3개 이상. 목록 안의 코드 블록을 위해 들여쓰기는 제한하지 않습니다.
+_FENCE = re.compile(r"^[ \t]*(`{3,}|~{3,})(.*)$")
+_FENCE_MARKERS = ("```", "~~~")
+# 문서 맨 앞의 머리말(front matter): YAML(---)과 TOML(+++)
+_FRONT_MATTER = {"---": ("---", "..."), "+++": ("+++",)}
+# 이 줄 수 안에 닫히지 않는 머리말은 머리말이 아닌 것으로 봅니다. (문서 전체를 머리말로 삼키지 않도록)
+_MAX_FRONT_MATTER_LINES = 1000
+_LINE_BREAKS = ("\n", "\r")  # open(newline='')이 줄을 나누는 줄바꿈 ("\r\n"은 따로 처리)
+
+
+@dataclass
+class MarkdownChunk:
+    """제목 단위 문단과 원본 파일에서의 바이트 위치 [start, end)"""
+    text: str
+    start: int
+    end: int
+
+
+def fence_state(open_fence: tuple[str, int] | None, line: str) -> tuple[str, int] | None:
+    """줄 하나를 읽은 뒤의 코드 블록 상태를 반환합니다. (열린 펜스 문자와 길이, 코드 블록 밖이면 None)
+
+    닫는 펜스는 여는 펜스와 같은 문자로 같거나 더 길어야 하고 뒤에 공백만 올 수 있습니다.
+    백틱 펜스의 정보 문자열(```py 등)에는 백틱이 올 수 없습니다.
+    """
+    match = _FENCE.match(line)
+    if match is None:
+        return open_fence
+    marker, rest = match.groups()
+    if open_fence is None:
+        if marker[0] == "`" and "`" in rest:
+            return None  # 인라인 코드(```code```)이지 펜스가 아닙니다.
+        return marker[0], len(marker)
+    char, length = open_fence
+    if marker[0] == char and len(marker) >= length and not rest.strip():
+        return None
+    return open_fence
+
+
+def _strip_line_break(line: str) -> str:
+    if line.endswith("\r\n"):
+        return line[:-2]
+    if line[-1:] in _LINE_BREAKS:
+        return line[:-1]
+    return line
+
+
+def _read_front_matter(lines: Iterator[str]) -> tuple[list[str], bool]:
+    """문서 맨 앞 줄들을 읽어 (읽은 줄들, 머리말이 닫혔는지)를 반환합니다.
+
+    첫 줄이 머리말 시작(---/+++)이 아니면 첫 줄만 읽습니다. 머리말이 _MAX_FRONT_MATTER_LINES 안에
+    닫히지 않으면 거기까지 읽은 줄들을 돌려주므로, 호출하는 쪽에서 일반 본문으로 다시 처리합니다.
+    """
+    first = next(lines, None)
+    if first is None:
+        return [], False
+    closers = _FRONT_MATTER.get(_strip_line_break(first).rstrip())
+    if closers is None:
+        return [first], False
+    head = [first]
+    for line in lines:
+        head.append(line)
+        if _strip_line_break(line).rstrip() in closers:
+            return head, True
+        if len(head) >= _MAX_FRONT_MATTER_LINES:
+            break
+    return head, False
+
+
+def iter_markdown_chunks(lines: Iterable[str]) -> Iterator[MarkdownChunk]:
+    """줄바꿈이 붙은 줄들을 한 번 훑으며 제목(#)으로 시작하는 문단을 차례대로 생성합니다.
+
+    코드 블록(``` 또는 ~~~) 안과 문서 맨 앞 머리말(---/+++) 안의 '#'은 제목으로 보지 않습니다.
+    머리말이 닫히지 않으면(본문 첫 줄의 수평선 등) 머리말로 보지 않고 본문으로 나눕니다.
+    현재 문단의 줄만 메모리에 두므로 문서 크기와 관계없이 메모리 사용량이 일정합니다.
+    문단 텍스트는 줄바꿈 없이 "\\n"으로 이어 붙이므로, 문단들을 "\\n"으로 이으면 원본(줄바꿈은 "\\n"으로 통일)과 같습니다.
+    """
+    current = []
+    start = offset = 0
+    open_fence = None
+    lines = iter(lines)
+    head, closed = _read_front_matter(lines)
+    if closed:
+        # 머리말은 첫 문단의 앞부분이 됩니다.
+        for line in head:
+            current.append(_strip_line_break(line))
+            offset += len(line) if line.isascii() else len(line.encode('utf-8'))
+    else:
+        lines = chain(head, lines)
+    line = head[-1] if head else ""
+    for line in lines:
+        # 줄마다 호출하는 함수를 줄이기 위해 줄바꿈 제거와 바이트 길이 계산을 여기서 직접 합니다.
+        if line.endswith("\r\n"):
+            text = line[:-2]
+        elif line[-1:] in _LINE_BREAKS:
+            text = line[:-1]
+        else:
+            text = line
+        if text.lstrip(" \t")[:3] in _FENCE_MARKERS:
+            open_fence = fence_state(open_fence, text)
+        if text.startswith('#') and open_fence is None and current:
+            yield MarkdownChunk("\n".join(current), start, offset)
+            current = []
+            start = offset
+        current.append(text)
+        offset += len(line) if line.isascii() else len(line.encode('utf-8'))
+    if line[-1:] in _LINE_BREAKS:
+        # 줄바꿈으로 끝나는 문서는 끝에 빈 줄이 있는 것으로 봅니다. (문단을 "\n"으로 이으면 원본과 같도록)
+        current.append("")
+    if current:
+        yield MarkdownChunk("\n".join(current), start, offset)
+
+
+def iter_markdown_file(path) -> Iterator[MarkdownChunk]:
+    """마크다운 파일을 한 줄씩 읽으며 문단을 생성합니다. 파일 전체를 메모리에 올리지 않습니다."""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        yield from iter_markdown_chunks(f)
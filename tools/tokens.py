@@ -0,0 +1,30 @@
+"""
+토크나이저 없이 빠르게 토큰 수를 추정하는 도구
+"""
+import math
+
+
+def estimate_tokens(text: str) -> int:
+    """텍스트의 토큰 수를 추정합니다.
+
+    영문·코드 등 ASCII 문자는 약 4자당 1토큰, 한글 등 그 외 문자는 1자당 1토큰으로 계산합니다.
+    정확한 값이 아니라 문단 크기 조절과 비용 예측에 쓰는 근사치입니다.
+    """
+    if not text:
+        return 0
+    non_ascii = len(text) - len(text.encode('ascii', 'ignore'))
+    ascii_chars = len(text) - non_ascii
+    return math.ceil(ascii_chars / 4) + non_ascii
+
+
+def prompt_to_text(prompt) -> str:
+    """문자열 프롬프트 또는 메시지 리스트를 하나의 텍스트로 합칩니다."""
+    if isinstance(prompt, str):
+        return prompt
+    parts = []
+    for message in prompt:
+        content = message.content if hasattr(message, "content") else message["content"]
+        if isinstance(content, list):
+            content = "".join(block.get("text", "") for block in content if isinstance(block, dict))
+        parts.append(content)
+    return "\n".join(parts)
@@ -0,0 +1,101 @@
+"""
+번역 결과를 디스크에 저장해 재사용하는 SQLite 기반 번역 메모리
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+def hash_file(path: str) -> str:
+    """파일 내용의 해시를 반환합니다. 단어사전 버전 등을 구분하는 데 사용합니다."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def make_cache_key(chunk: str, prompt, glossary_version: str, model_name: str) -> str:
+    """문단, 최종 프롬프트, 단어사전 버전, 모델 이름으로 번역 메모리 키를 만듭니다."""
+    payload = json.dumps(
+        [chunk, prompt, glossary_version, model_name],
+        ensure_ascii=False,
+        default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class TranslationMemory:
+    """문단 번역 결과를 저장하고, 전체 크기가 max_bytes를 넘으면 오래 쓰지 않은 항목부터 지웁니다."""
+
+    def __init__(self, db_path: str, max_bytes: int = 512 * 1024 * 1024):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS translations (
+                    key TEXT PRIMARY KEY,
+                    translation TEXT NOT NULL,
+                    model TEXT,
+                    size INTEGER NOT NULL,
+                    created REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations(last_used)"
+            )
+
+    def get(self, key: str) -> str | None:
+        """저장된 번역을 반환합니다. 없으면 None을 반환합니다."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT translation FROM translations WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE translations SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+            return row[0]
+
+    def put(self, key: str, translation: str, model_name: str = ""):
+        """번역을 저장하고 필요하면 오래된 항목을 정리합니다."""
+        now = time.time()
+        size = len(translation.encode('utf-8'))
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO translations (key, translation, model, size, created, last_used)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, translation, model_name, size, now, now)
+            )
+            self._evict()
+
+    def _evict(self):
+        """전체 크기가 max_bytes 이하가 될 때까지 가장 오래 쓰지 않은 항목을 삭제합니다."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM translations").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM translations ORDER BY last_used ASC"
+        )
+        stale_keys = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale_keys.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM translations WHERE key = ?", stale_keys)
+
+    def close(self):
+        self._conn.close()
@@ -1,7 +1,33 @@
-import json
+import hashlib
+import io
+import os
 from pathlib import Path
 import streamlit as st
-from tools.display import display_translation_results
+from tools.display import display_glossary_compliance, display_translation_results
+from tools.translation_memory import TranslationMemory
+from tools.scheduler import AdaptiveLimiter
+from tools.jobs import JobManager
+from tools.glossary import CompiledGlossary, get_glossary_terms, glossary_instruction, load_compiled_glossary
+from tools.chunking import load_chunk_layout, split_by_line_counts
+from tools.splitter import iter_markdown_chunks
+from tools.documents import read_translation_pair
+from tools.analysis import check_glossary_compliance
+
+def get_api_key(model_name: str) -> str:
+    """모델 이름에 맞는 API 키를 환경변수에서 가져옵니다."""
+    if 'gpt' in model_name:
+        return os.getenv("OPENAI_API_KEY", "")
+    elif 'claude' in model_name:
+        return os.getenv("ANTHROPIC_API_KEY", "")
+    return ""  # Default to empty if no matching model name
+
+def is_up_to_date(output_file, dependencies: list) -> bool:
+    """출력 파일이 원본·프롬프트·단어사전보다 최신이면 True를 반환합니다."""
+    output_file = Path(output_file)
+    if not output_file.exists():
+        return False
+    output_mtime = output_file.stat().st_mtime
+    return all(output_mtime >= Path(dep).stat().st_mtime for dep in dependencies)
 
 @st.cache_data
 def load_prompt_template(prompt_path: str) -> str:
@@ -9,66 +35,89 @@ def load_prompt_template(prompt_path: str) -> str:
     with open(prompt_path, 'r', encoding='utf-8') as f:
         return f.read()
 
-@st.cache_data
-def load_glossary(_glossary_path: str) -> list:
-    """단어사전 파일을 로드하고 캐시합니다."""
-    with open(_glossary_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def get_glossary_terms(glossary_data: list) -> tuple[list, list]:
-    """단어사전에서 원문/번역문 용어 리스트를 추출합니다."""
-    source_terms = [entry["source"] for entry in glossary_data]
-    target_terms = []
-    for entry in glossary_data:
-        target = entry["target"]  # 항상 리스트
-        target_terms.extend(target)
-    return source_terms, target_terms
+def load_glossary(glossary_path: str) -> CompiledGlossary:
+    """단어사전 파일을 컴파일된 색인과 함께 로드합니다.
+
+    단어사전 CSV/JSON이 바뀌면 자동으로 다시 읽고, 바뀌지 않았으면 이미 읽은 단어사전을 재사용합니다.
+    """
+    return load_compiled_glossary(glossary_path)
+
+@st.cache_resource
+def get_translation_memory(db_path: str, max_bytes: int) -> TranslationMemory:
+    """번역 메모리를 열고 세션 간에 공유합니다."""
+    return TranslationMemory(db_path, max_bytes)
+
+@st.cache_resource
+def _get_provider_limiter(provider: str, _max_concurrency: int) -> AdaptiveLimiter:
+    # 밑줄로 시작하는 인자는 캐시 키에 들어가지 않으므로 제공자마다 조절기가 하나만 만들어집니다.
+    return AdaptiveLimiter(_max_concurrency)
+
+def get_rate_limiter(provider: str, max_concurrency: int) -> AdaptiveLimiter:
+    """제공자별 동시 요청 한도 조절기를 반환합니다. 모든 세션이 같은 조절기를 함께 사용합니다.
+
+    동시 요청 수 설정이 달라도 새 조절기를 만들지 않고 상한만 바꾸므로, 같은 제공자에 대한 요청은
+    항상 하나의 한도와 사용량 제한(429) 상태를 공유합니다.
+    """
+    limiter = _get_provider_limiter(provider, max_concurrency)
+    limiter.set_max_concurrency(max_concurrency)
+    return limiter
+
+@st.cache_resource
+def get_job_manager() -> JobManager:
+    """백그라운드 번역 작업 관리자를 만들고 모든 세션이 함께 사용합니다."""
+    return JobManager(max_jobs=int(os.getenv("TRANSLATION_MAX_JOBS", "4")))
 
 def prepare_final_prompt(base_prompt: str, glossary_data: list) -> str:
     """프롬프트 템플릿에 단어사전 규칙을 결합합니다."""
-    instructions = []
-    for entry in glossary_data:
-        source = entry["source"]
-        target = entry["target"]  # 항상 리스트
-        target_str = json.dumps(target, ensure_ascii=False)
-        instructions.append(f'- "{source}" → {target_str}')
-    glossary_instructions = "\n".join(instructions)
+    if isinstance(glossary_data, CompiledGlossary):
+        return base_prompt.replace("{glossary_instructions}", glossary_data.instructions)
+    glossary_instructions = "\n".join(glossary_instruction(entry) for entry in glossary_data)
     return base_prompt.replace("{glossary_instructions}", glossary_instructions)
 
 def split_markdown_by_headings(markdown_content: str) -> list[str]:
-    """마크다운 콘텐츠를 제목(#) 기준으로 분할하되, 코드 블록 내의 주석은 제외합니다."""
-    chunks = []
-    current_chunk_lines = []
-    in_code_block = False
-    for line in markdown_content.splitlines():
-        if line.strip().startswith('```'):
-            in_code_block = not in_code_block
-        
-        if line.startswith('#') and not in_code_block:
-            if current_chunk_lines:
-                chunks.append("\n".join(current_chunk_lines))
-            current_chunk_lines = [line]
-        else:
-            current_chunk_lines.append(line)
-    if current_chunk_lines:
-        chunks.append("\n".join(current_chunk_lines))
-    return chunks
+    """마크다운 콘텐츠를 제목(#) 기준으로 분할하되, 코드 블록(``` 또는 ~~~)과 머리말 안의 '#'은 제외합니다.
+
+    iter_markdown_file과 같이 "\\n", "\\r\\n", "\\r"에서만 줄을 나눕니다. 큰 파일은 tools.splitter.iter_markdown_file로
+    파일을 한 줄씩 읽으며 나누세요.
+    """
+    return [chunk.text for chunk in iter_markdown_chunks(io.StringIO(markdown_content, newline=''))]
+
+def split_translation_pair(source_content: str, target_content: str, target_path: str) -> tuple[list, list]:
+    """번역 파일에 기록된 문단 경계가 있으면 그 경계로, 없으면 제목(#) 기준으로 원본과 번역을 나눕니다."""
+    layout = load_chunk_layout(target_path)
+    if layout:
+        source_chunks = split_by_line_counts(source_content, layout["source"])
+        target_chunks = split_by_line_counts(target_content, layout["target"])
+        if source_chunks is not None and target_chunks is not None:
+            return source_chunks, target_chunks
+    return split_markdown_by_headings(source_content), split_markdown_by_headings(target_content)
+
+def _chunks_digest(chunks: list[str]) -> str:
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk.encode('utf-8'))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+@st.cache_data(max_entries=16)
+def _glossary_compliance_report(source_digest: str, target_digest: str, glossary_path: str, glossary_signature,
+                                _source_chunks, _target_chunks, _glossary_data) -> dict:
+    # 밑줄로 시작하는 인자는 캐시 키에 들어가지 않으므로 문단 해시와 단어사전 서명으로만 결과를 찾습니다.
+    return check_glossary_compliance(_source_chunks, _target_chunks, _glossary_data)
+
+def _glossary_compliance_cached(source_chunks, target_chunks, glossary_data, glossary_path) -> dict:
+    """원본·번역 내용과 단어사전이 같으면 단어사전 준수 검사를 다시 하지 않습니다. (화면을 다시 그릴 때마다 호출됨)"""
+    return _glossary_compliance_report(
+        _chunks_digest(source_chunks), _chunks_digest(target_chunks), str(glossary_path),
+        getattr(glossary_data, "signature", None), source_chunks, target_chunks, glossary_data
+    )
 
 def load_and_display_existing_translation(source_path, target_path, glossary_path, result_title, save_path):
     """기존 번역 파일을 로드하고 표시하는 공통 함수"""
     try:
-        # 원본 문서 로드 및 분할
-        with open(source_path, 'r', encoding='utf-8') as f:
-            source_content = f.read()
-        
-        source_chunks = split_markdown_by_headings(source_content)
+        # 원본·번역 문서 로드 및 분할
+        source_chunks, target_chunks = read_translation_pair(source_path, target_path)
         st.session_state.source_chunks = source_chunks
-        
-        # 번역 파일 로드 및 분할
-        with open(target_path, 'r', encoding='utf-8') as f:
-            target_content = f.read()
-        
-        target_chunks = split_markdown_by_headings(target_content)
         st.session_state.target_chunks = target_chunks
         
         st.info(f"✅ 총 {len(source_chunks)}개의 문단으로 나누어 번역했습니다.")
@@ -77,8 +126,12 @@ def load_and_display_existing_translation(source_path, target_path, glossary_pat
         target_chunks = st.session_state.target_chunks
         glossary_data = load_glossary(glossary_path)
         source_terms, target_terms = get_glossary_terms(glossary_data)
+        if len(source_chunks) == len(target_chunks):
+            display_glossary_compliance(_glossary_compliance_cached(source_chunks, target_chunks, glossary_data, glossary_path))
 
-        display_translation_results(source_chunks, target_chunks, source_terms, target_terms, result_title, save_path)
+        layout = load_chunk_layout(target_path)
+        reviewed = layout.get("reviewed") if layout else None
+        display_translation_results(source_chunks, target_chunks, source_terms, target_terms, result_title, save_path, reviewed)
 
     except Exception as e:
         st.error(f"결과를 표시하는 중 오류가 발생했습니다: {e}") 
\ No newline at end of file
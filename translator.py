@@ -2,8 +2,8 @@
 """
 Streamlit 기반의 대화형 문서 번역기
 """
-import os
 import time
+from functools import partial
 from pathlib import Path
 import streamlit as st
 from dotenv import load_dotenv
@@ -12,11 +12,29 @@ from tools.utils import (
     load_prompt_template,
     load_glossary,
     get_glossary_terms,
-    prepare_final_prompt,
     split_markdown_by_headings,
-    load_and_display_existing_translation
+    split_translation_pair,
+    load_and_display_existing_translation,
+    get_translation_memory,
+    get_rate_limiter,
+    get_job_manager,
+    get_api_key,
+    is_up_to_date
 )
-from tools.display import highlight_terms
+from tools.display import display_cost_estimate, display_job_progress, display_language_progress, display_metrics_summary
+from tools.pipeline import build_chunk_prompts, translate_document, save_translation_result, supports_cache_control
+from tools.jobs import DONE, CANCELLED, TranslationJob, make_translation_job_id
+from tools.translation_memory import hash_file
+from tools.chunking import load_chunk_layout, pack_chunks
+from tools.splitter import iter_markdown_file
+from tools.metrics import MetricsLog
+from tools.scheduler import provider_of
+from tools.placeholders import CODE_BLOCKS, INLINE_CODE, URLS
+from tools.journal import TranslationJournal, make_job_id
+from tools.incremental import carry_reviewed_flags, load_source_snapshot, plan_incremental_update, repack_incremental
+from tools.multilang import language_output_path, language_path, parse_languages
+from tools.fuzzy_memory import find_fuzzy_matches, load_fuzzy_memory, split_fuzzy_matches
+from tools.analysis import estimate_translation
 
 # --- Streamlit UI ---
 
@@ -34,6 +52,129 @@ if "mtpe_exist" not in st.session_state:
     st.session_state.mtpe_exist = False
 if "mt_exist" not in st.session_state:
     st.session_state.mt_exist = False
+if "language_jobs" not in st.session_state:
+    st.session_state.language_jobs = {}  # {언어: 작업 ID}
+if "job_id" not in st.session_state:
+    # 주소에 작업 ID가 있으면(탭을 닫았다가 다시 연 경우 등) 진행 중인 작업을 이어서 표시합니다.
+    st.session_state.job_id = st.query_params.get("job")
+
+
+def forget_job():
+    """세션과 주소에서 현재 작업 ID를 지웁니다."""
+    st.session_state.job_id = None
+    if "job" in st.query_params:
+        del st.query_params["job"]
+
+
+@st.fragment(run_every=1.0)
+def job_progress_view(job_id, source_terms, target_terms):
+    """백그라운드 작업의 진행 상황을 1초마다 다시 그립니다. 작업이 끝나면 앱 전체를 다시 실행합니다."""
+    job = get_job_manager().get(job_id)
+    if job is None or job.finished:
+        st.rerun()
+    if st.button("번역 취소", help="아직 시작하지 않은 문단을 취소합니다. 완료된 문단은 다시 시작할 때 이어받습니다."):
+        job.cancel()
+    display_job_progress(job.snapshot(), job.source_chunks, source_terms, target_terms, job.prompted)
+
+
+def show_finished_job(job):
+    """끝난 작업의 결과를 알리고 세션을 결과 보기 상태로 바꿉니다."""
+    snapshot = job.snapshot()
+    st.session_state.last_metrics = snapshot["metrics"]
+    forget_job()
+    if snapshot["cached"]:
+        st.info(f"♻️ 번역 메모리에서 {snapshot['cached']}개 문단을 재사용했습니다.")
+
+    if snapshot["status"] == DONE:
+        # 이전 문서의 수정 내용이 남아 있지 않도록 저장된 번역 파일에서 다시 읽습니다.
+        for key in [key for key in st.session_state if key.startswith(("edited_chunk_", "editing_chunk_", "temp_edit_", "reviewed_chunk_"))]:
+            del st.session_state[key]
+        st.session_state.translation_done = True
+        st.success(f"✅ 번역이 완료되어 다음 파일에 저장되었습니다: {job.output_path}")
+        if job.output_path == mtpe_path:
+            st.session_state.mtpe_exist = True
+        else:
+            st.session_state.mt_exist = True
+    elif snapshot["status"] == CANCELLED:
+        st.warning("⏹️ 번역을 취소했습니다. '번역 시작'을 다시 누르면 완료된 문단은 건너뛰고 이어서 번역합니다.")
+    elif snapshot["error"]:
+        st.error(f"오류가 발생했습니다: {snapshot['error']}")
+    else:
+        # 실패한 문단은 오류 메시지를 번역 결과로 저장하지 않고, 다시 시작하면 그 문단만 번역합니다.
+        failed_list = ", ".join(str(i + 1) for i in sorted(snapshot["errors"]))
+        st.error(
+            f"❌ {len(snapshot['errors'])}개 문단(문단 {failed_list})의 번역에 실패했습니다. "
+            "'번역 시작'을 다시 누르면 완료된 문단은 건너뛰고 실패한 문단만 다시 번역합니다."
+        )
+
+@st.fragment(run_every=1.0)
+def language_jobs_view(job_ids):
+    """추가 언어 번역 작업의 진행 상황을 한곳에서 1초마다 다시 그립니다. 모두 끝나면 앱 전체를 다시 실행합니다."""
+    manager = get_job_manager()
+    jobs = {lang: manager.get(job_id) for lang, job_id in job_ids.items()}
+    if all(job is None or job.finished for job in jobs.values()):
+        st.rerun()
+    for lang, job in jobs.items():
+        if job is not None:
+            display_language_progress(lang, job.snapshot(), job.output_path)
+
+
+def submit_language_jobs(llm, source_chunks, tm):
+    """이미 나눈 원본 문단을 추가 언어마다 언어별 프롬프트·단어사전으로 번역하는 작업을 제출합니다.
+
+    번역 파일이 원본·프롬프트·단어사전보다 최신인 언어는 건너뜁니다.
+    """
+    manager = get_job_manager()
+    for lang in extra_languages:
+        output_path = str(language_output_path(Path(mt_path).parent, source_path, lang))
+        lang_prompt_path = language_path(language_prompt_path, lang)
+        lang_glossary_path = language_path(language_glossary_path, lang)
+        try:
+            if is_up_to_date(output_path, [source_path, lang_prompt_path, lang_glossary_path]):
+                st.info(f"✅ [{lang}] 번역 파일이 최신 상태여서 건너뜁니다: {output_path}")
+                continue
+            base_prompt = load_prompt_template(lang_prompt_path)
+            glossary_data = load_glossary(lang_glossary_path)
+            glossary_version = hash_file(lang_glossary_path)
+        except FileNotFoundError as e:
+            st.error(f"[{lang}] 파일을 찾을 수 없습니다: {e.filename}")
+            continue
+
+        prompts, masks = build_chunk_prompts(
+            source_chunks, base_prompt, glossary_data, prune_glossary, protect_kinds,
+            cache_prefix=prompt_cache,
+            cache_control=prompt_cache and supports_cache_control(model_name)
+        )
+        journal = TranslationJournal(output_path, make_job_id(source_chunks, prompts, model_name))
+        metrics_log = MetricsLog(
+            metrics_path or None,
+            model=model_name,
+            document=source_path,
+            lang=lang,
+            glossary_size=len(glossary_data),
+            max_workers=max_workers
+        )
+        events = translate_document(
+            llm, source_chunks, prompts,
+            model_name=model_name,
+            glossary_version=glossary_version,
+            tm=tm,
+            max_workers=max_workers,
+            journal=journal,
+            metrics_log=metrics_log,
+            limiter=get_rate_limiter(provider_of(model_name), int(max_workers)),
+            max_retries=int(max_retries),
+            placeholders=masks
+        )
+        job = manager.submit(
+            TranslationJob(
+                make_translation_job_id(journal.job_id, output_path),
+                source_chunks, output_path, prompts, metrics_log.records
+            ),
+            events,
+            on_success=partial(save_translation_result, output_path, source_chunks, journal=journal)
+        )
+        st.session_state.language_jobs[lang] = job.id
 
 # --- Sidebar for Settings ---
 with st.sidebar:
@@ -46,12 +187,7 @@ with st.sidebar:
     model_name = st.text_input("모델 이름", value="claude-opus-4-20250514")
     
     # Load appropriate API key based on model name
-    if 'gpt' in model_name:
-        api_key = os.getenv("OPENAI_API_KEY", "")
-    elif 'claude' in model_name:
-        api_key = os.getenv("ANTHROPIC_API_KEY", "")
-    else:
-        api_key = ""  # Default to empty if no matching model name
+    api_key = get_api_key(model_name)
 
     api_key = st.text_input(
         "API Key", 
@@ -66,13 +202,117 @@ with st.sidebar:
     glossary_path = st.text_input("단어사전", value="./glossary/glossary.json")
     mt_path = st.text_input("번역 결과 저장 경로", value="./mt/models_ko.md")
     mtpe_path = st.text_input("번역 수정 결과 저장 경로", value="./mtpe/models_ko.md")
+    extra_languages = parse_languages(st.text_input(
+        "추가 번역 언어",
+        value="",
+        help="쉼표로 구분한 언어 코드(예: ja, zh). 원본을 한 번만 나눠 언어별 프롬프트·단어사전으로 동시에 번역하고, "
+             "번역 결과 저장 경로의 폴더 아래 <언어>/ 폴더에 저장합니다. (예: ./mt/ja/models_ja.md)"
+    ))
+    language_prompt_path = st.text_input("언어별 프롬프트 템플릿", value="./prompts/nmt_{lang}.yaml", help="{lang}은 언어 코드로 바뀝니다.")
+    language_glossary_path = st.text_input("언어별 단어사전", value="./glossary/{lang}/glossary.json", help="{lang}은 언어 코드로 바뀝니다.")
+
+    st.subheader("성능")
+    max_workers = st.number_input(
+        "동시 번역 문단 수",
+        min_value=1,
+        max_value=32,
+        value=4,
+        help="한 번에 LLM에 요청하는 문단 수입니다. API 사용량 제한에 맞게 조정하세요."
+    )
+    max_retries = st.number_input(
+        "최대 재시도 횟수",
+        min_value=0,
+        max_value=20,
+        value=5,
+        help="사용량 제한(429)·과부하·일시적 오류가 나면 지수 백오프로 다시 시도합니다. 동시 요청 수도 자동으로 줄였다가 다시 늘립니다."
+    )
+    use_tm = st.checkbox(
+        "번역 메모리 사용",
+        value=True,
+        help="이전에 같은 모델·프롬프트·단어사전으로 번역한 문단은 LLM을 호출하지 않고 재사용합니다."
+    )
+    tm_path = st.text_input("번역 메모리 경로", value="./.cache/translation_memory.sqlite3")
+    tm_max_mb = st.number_input("번역 메모리 최대 크기(MB)", min_value=1, value=512)
+    max_chunk_tokens = st.number_input(
+        "문단 최대 토큰 수",
+        min_value=0,
+        value=0,
+        step=100,
+        help="0이면 제목(#) 기준으로만 나눕니다. 값을 정하면 작은 문단은 합치고 큰 문단은 단락·목록 경계에서 나눕니다. (코드 블록은 나누지 않음)"
+    )
+    prune_glossary = st.checkbox(
+        "문단별 단어사전 필터링",
+        value=False,
+        help="각 문단에 등장하는 용어(대소문자·단순 활용형 포함)의 규칙만 프롬프트에 넣어 입력 토큰을 줄입니다."
+    )
+    prompt_cache = st.checkbox(
+        "프롬프트 캐싱",
+        value=True,
+        help="단어사전·지시문 접두부를 시스템 메시지로 분리해 제공자가 요청 사이에 캐시하도록 합니다. Claude 모델은 캐시 지점을 표시합니다. 첫 문단 이후 입력 비용과 첫 토큰 지연이 줄어듭니다."
+    )
+    protect_labels = {"코드 블록": CODE_BLOCKS, "인라인 코드": INLINE_CODE, "URL": URLS}
+    protected = st.multiselect(
+        "번역하지 않고 유지할 요소",
+        list(protect_labels),
+        default=["코드 블록"],
+        help="선택한 요소는 자리표시자로 바꿔 LLM에 보내지 않고, 번역 후 원문 그대로 되돌립니다. 입력·출력 토큰이 줄고 코드가 바뀌지 않습니다."
+    )
+    protect_kinds = tuple(protect_labels[label] for label in protected)
+    use_fuzzy_tm = st.checkbox(
+        "검수 번역 참고",
+        value=True,
+        help="번역 수정 결과 저장 경로 폴더의 사후교정 번역에서 비슷한 문단을 찾아, 참고 번역으로 프롬프트에 넣거나 그대로 재사용합니다."
+    )
+    fuzzy_threshold = st.number_input(
+        "참고 번역 최소 유사도",
+        min_value=0.3,
+        max_value=1.0,
+        value=0.6,
+        step=0.05,
+        help="원문 3-gram의 자카드 유사도가 이 값 이상인 검수 번역을 참고 번역으로 넣습니다."
+    )
+    fuzzy_reuse_threshold = st.number_input(
+        "검수 번역 재사용 유사도",
+        min_value=0.5,
+        max_value=1.0,
+        value=1.0,
+        step=0.05,
+        help="유사도가 이 값 이상이면 LLM을 호출하지 않고 검수 번역을 그대로 사용합니다. 1.0이면 공백만 다른 같은 문단만 재사용합니다."
+    )
+    metrics_path = st.text_input("성능 지표 기록 경로", value="./logs/metrics.jsonl")
+    incremental_update = st.checkbox(
+        "변경된 문단만 재번역",
+        value=True,
+        help="기존 번역 파일을 만든 뒤 원본 문서가 바뀌었다면, 추가·수정된 문단만 번역하고 나머지는 기존 번역(사후교정 포함)을 유지합니다."
+    )
+
+    estimate_models = [model_name] + [model.strip() for model in st.text_input(
+        "비용 비교 모델",
+        value="",
+        help="쉼표로 구분한 모델 이름(예: gpt-4o). 비용 미리 보기에서 위 모델과 함께 예상 비용을 비교합니다."
+    ).split(",") if model.strip() and model.strip() != model_name]
 
     if st.button("번역 시작", type="primary"):
         st.session_state.show_progress_view = True
         st.session_state.translation_done = False
         st.rerun()
+    estimate_requested = st.button("비용 미리 보기", help="LLM을 호출하지 않고 현재 설정으로 문단별 토큰 수와 모델별 예상 비용을 계산합니다.")
 
 # --- Main App Logic ---
+if estimate_requested:
+    try:
+        estimate_chunks = pack_chunks([chunk.text for chunk in iter_markdown_file(source_path)], max_chunk_tokens)
+        estimate_prompts, estimate_masks = build_chunk_prompts(
+            estimate_chunks, load_prompt_template(prompt_path), load_glossary(glossary_path), prune_glossary, protect_kinds,
+            cache_prefix=prompt_cache,
+            cache_control=prompt_cache and supports_cache_control(model_name)
+        )
+        display_cost_estimate(estimate_translation(estimate_chunks, estimate_prompts, estimate_models, estimate_masks))
+    except FileNotFoundError as e:
+        st.error(f"파일을 찾을 수 없습니다: {e.filename}")
+    except Exception as e:
+        st.error(f"오류가 발생했습니다: {e}")
+
 if st.session_state.show_progress_view:
     st.session_state.show_progress_view = False  # 한번만 실행되도록 재설정
 
@@ -80,8 +320,35 @@ if st.session_state.show_progress_view:
         st.error("API 키를 입력해주세요.")
     elif not all([source_path, prompt_path, glossary_path, mt_path]):
         st.error("모든 파일 경로를 올바르게 입력해주세요.")
+    elif not Path(source_path).exists():
+        st.error(f"파일을 찾을 수 없습니다: {source_path}")
     else:
-        if Path(mtpe_path).exists():
+        # llm = ChatOpenAI(model=model_name, temperature=0.1, openai_api_key=api_key)
+        llm = ChatLiteLLM(
+            model=model_name,
+            temperature=0.1,
+            api_key=api_key
+        )
+        tm = get_translation_memory(tm_path, int(tm_max_mb) * 1024 * 1024) if use_tm else None
+
+        # 원본은 한 번만 읽고 나눠 기본 번역과 추가 언어 번역이 함께 사용합니다.
+        heading_chunks = [chunk.text for chunk in iter_markdown_file(source_path)]
+        source_chunks = pack_chunks(heading_chunks, max_chunk_tokens)
+        if extra_languages:
+            submit_language_jobs(llm, source_chunks, tm)
+
+        # 기존 번역 파일을 만들 때 사용한 원본과 현재 원본이 다르면 변경된 문단만 다시 번역합니다.
+        existing_path = next((p for p in (mtpe_path, mt_path) if Path(p).exists()), None)
+        old_source = load_source_snapshot(existing_path) if incremental_update and existing_path else None
+        source_changed = False
+        if old_source is not None:
+            old_heading_chunks = split_markdown_by_headings(old_source)
+            source_changed = heading_chunks != old_heading_chunks
+
+        if source_changed:
+            st.info(f"🔄 원본 문서가 변경되어 변경된 문단만 다시 번역합니다: {existing_path}")
+
+        elif Path(mtpe_path).exists():
             st.success(f"✅ 기계번역 사후교정 파일이 이미 존재하여 불러옵니다: {mtpe_path}")
             st.session_state.mtpe_exist = True
             time.sleep(2)
@@ -94,96 +361,144 @@ if st.session_state.show_progress_view:
             time.sleep(2)
             st.rerun()
 
-        else:
+        if source_changed or not existing_path:
             # Proceed with LLM translation as before
+            output_path = existing_path if source_changed else mt_path
             try:
                 # 1. 초기화
-                # llm = ChatOpenAI(model=model_name, temperature=0.1, openai_api_key=api_key)
-                llm = ChatLiteLLM(
-                    model=model_name,
-                    temperature=0.1,
-                    api_key=api_key
-                )
                 base_prompt = load_prompt_template(prompt_path)
                 glossary_data = load_glossary(glossary_path)
-                final_prompt_template = prepare_final_prompt(base_prompt, glossary_data)
-                source_terms, target_terms = get_glossary_terms(glossary_data)
-
-                # 2. 원본 문서 로드 및 분할
-                with open(source_path, 'r', encoding='utf-8') as f:
-                    source_content = f.read()
-                
-                source_chunks = split_markdown_by_headings(source_content)
+
+                # 변경되지 않은 문단은 기존 번역을 그대로 사용합니다.
+                # 문단을 처음부터 다시 묶으면 경계가 밀려 재사용할 수 없으므로 기존 문단 경계를 유지해 묶습니다.
+                reused = {}
+                reviewed = None
+                if source_changed:
+                    with open(existing_path, 'r', encoding='utf-8') as f:
+                        old_source_chunks, old_target_chunks = split_translation_pair(old_source, f.read(), existing_path)
+                    source_chunks = repack_incremental(old_source_chunks, old_heading_chunks, heading_chunks, max_chunk_tokens)
+                    reused = plan_incremental_update(old_source_chunks, old_target_chunks, source_chunks)
+                    # 사후교정 파일을 다시 저장해도 재사용하는 문단의 검수 기록이 사라지지 않게 옮겨 둡니다.
+                    old_layout = load_chunk_layout(existing_path)
+                    reviewed = carry_reviewed_flags(
+                        old_source_chunks, old_layout.get("reviewed") if old_layout else None, source_chunks, reused
+                    )
+                    st.info(f"♻️ 기존 번역에서 {len(reused)}개 문단을 유지하고 {len(source_chunks) - len(reused)}개 문단을 번역합니다.")
+
+                # 2. 위에서 나눈 원본 문단 사용
                 st.session_state.source_chunks = source_chunks
-                
+
+                # 사후교정 폴더의 검수 번역 중 비슷한 문단은 그대로 쓰거나 참고 번역으로 넣습니다.
+                references = {}
+                if use_fuzzy_tm:
+                    fuzzy_memory = load_fuzzy_memory(Path(mtpe_path).parent)
+                    matches = find_fuzzy_matches(fuzzy_memory, source_chunks, fuzzy_threshold, skip=reused)
+                    fuzzy_reused, references = split_fuzzy_matches(matches, fuzzy_reuse_threshold)
+                    reused.update(fuzzy_reused)
+                    if matches:
+                        st.info(f"📚 검수 번역에서 {len(fuzzy_reused)}개 문단을 재사용하고 {len(references)}개 문단에 참고 번역을 넣습니다.")
+
                 st.info(f"✅ 총 {len(source_chunks)}개의 문단으로 나누어 번역을 시작합니다.")
 
-                # 3. 실시간 스트리밍 번역 및 결과 표시
-                for i, chunk in enumerate(source_chunks):
-                    st.subheader(f"문단 {i+1}/{len(source_chunks)}")
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.markdown("### 원본")
-                        highlighted_source = highlight_terms(chunk, source_terms)
-                        with st.container(border=True):
-                            st.markdown(highlighted_source, unsafe_allow_html=True)
-
-                    with col2:
-                        st.markdown("### 번역 결과")
-                        with st.container(border=True):
-                            if not chunk.strip():
-                                final_chunk = chunk
-                                st.markdown(final_chunk)
-                            else:
-                                prompt = final_prompt_template.replace("{source}", chunk)
-                                
-                                placeholder = st.empty()
-                                final_chunk = ""
-                                try:
-                                    for response in llm.stream(prompt):
-                                        content = response.content
-                                        if content:
-                                            final_chunk += content
-                                            placeholder.markdown(final_chunk + "▌") # 실시간 커서 효과
-                                    
-                                    highlighted_final = highlight_terms(final_chunk, target_terms)
-                                    placeholder.markdown(highlighted_final, unsafe_allow_html=True)
-                                except Exception as e:
-                                    st.error(f"스트리밍 중 오류 발생: {e}")
-                                    final_chunk = f"오류: {e}"
-
-                            st.session_state[f"edited_chunk_{i}"] = final_chunk
-
-                st.session_state.translation_done = True
-                # st.success("🎉 번역이 완료되었습니다! 잠시 후 수정 모드로 전환됩니다.")
-
-                # Save the completed translation result to mt_path
-                final_chunks = []
-                for i in range(len(source_chunks)):
-                    edited_content = st.session_state.get(f"edited_chunk_{i}", "")
-                    final_chunks.append(edited_content)
-                
-                final_content = "\n".join(final_chunks)
-                
-                output_dir = Path(mt_path).parent
-                output_dir.mkdir(parents=True, exist_ok=True)
-                with open(mt_path, 'w', encoding='utf-8') as f:
-                    f.write(final_content)
-                
-                st.success(f"✅ 번역이 완료되어 다음 파일에 저장되었습니다: {mt_path}")
-                st.session_state.mt_exist = True
-
-                time.sleep(2)
-                st.rerun()
+                glossary_version = hash_file(glossary_path)
+                prompts, masks = build_chunk_prompts(
+                    source_chunks, base_prompt, glossary_data, prune_glossary, protect_kinds,
+                    cache_prefix=prompt_cache,
+                    cache_control=prompt_cache and supports_cache_control(model_name),
+                    references=references
+                )
+
+                # 3. 백그라운드 작업으로 제출합니다. 화면은 진행 상황을 주기적으로 읽어 그리기만 하므로
+                #    다른 위젯을 조작하거나 탭을 닫아도 번역은 계속되고, 끝나면 작업 스레드가 결과를 저장합니다.
+                #    빈 문단, 유지할 기존 번역, 번역 메모리에 있는 문단은 LLM 호출 없이 바로 완료됩니다.
+                # 문단이 끝날 때마다 작업 기록에 남겨, 중단되었다가 같은 작업을 다시 시작하면 이어서 번역합니다.
+                journal = TranslationJournal(output_path, make_job_id(source_chunks, prompts, model_name))
+                resumed = len(journal.completed())
+                failed = len(journal.failed())
+                if resumed:
+                    retry_note = f" 지난번에 실패한 {failed}개 문단은 다시 번역합니다." if failed else ""
+                    st.info(f"⏯️ 이전에 중단된 번역에서 {resumed}개 문단을 이어받습니다.{retry_note}")
+                elif failed:
+                    st.info(f"⏯️ 지난번에 실패한 {failed}개 문단을 다시 번역합니다.")
+
+                metrics_log = MetricsLog(
+                    metrics_path or None,
+                    model=model_name,
+                    document=source_path,
+                    glossary_size=len(glossary_data),
+                    max_workers=max_workers
+                )
+                events = translate_document(
+                    llm, source_chunks, prompts,
+                    model_name=model_name,
+                    glossary_version=glossary_version,
+                    tm=tm,
+                    reused=reused,
+                    max_workers=max_workers,
+                    journal=journal,
+                    metrics_log=metrics_log,
+                    limiter=get_rate_limiter(provider_of(model_name), int(max_workers)),
+                    max_retries=int(max_retries),
+                    placeholders=masks
+                )
+                job = TranslationJob(
+                    make_translation_job_id(journal.job_id, output_path),
+                    source_chunks, output_path, prompts, metrics_log.records
+                )
+                job = get_job_manager().submit(
+                    job, events,
+                    on_success=lambda final_chunks: save_translation_result(
+                        output_path, source_chunks, final_chunks, journal, reviewed
+                    )
+                )
+                st.session_state.job_id = job.id
+                st.query_params["job"] = job.id
 
             except FileNotFoundError as e:
                 st.error(f"파일을 찾을 수 없습니다: {e.filename}")
             except Exception as e:
                 st.error(f"오류가 발생했습니다: {e}")
 
-if st.session_state.mtpe_exist:
+# 추가 언어 번역 작업 (기본 번역과 별도로 진행되며 한곳에 진행 상황을 표시합니다.)
+if st.session_state.language_jobs:
+    manager = get_job_manager()
+    language_jobs = {lang: manager.get(job_id) for lang, job_id in st.session_state.language_jobs.items()}
+    with st.expander("🌐 추가 언어 번역", expanded=True):
+        if any(job is not None and not job.finished for job in language_jobs.values()):
+            language_jobs_view(st.session_state.language_jobs)
+        else:
+            # 모두 끝났으면 마지막 상태를 한 번 보여주고 목록을 비웁니다.
+            for lang, job in language_jobs.items():
+                if job is None:
+                    st.warning(f"[{lang}] 번역 작업을 찾을 수 없습니다. 서버가 다시 시작되었다면 '번역 시작'을 다시 눌러 이어서 번역하세요.")
+                else:
+                    display_language_progress(lang, job.snapshot(), job.output_path)
+            st.session_state.language_jobs = {}
+
+# 백그라운드 번역 작업
+job_running = False
+if st.session_state.job_id:
+    job = get_job_manager().get(st.session_state.job_id)
+    if job is None:
+        st.warning("번역 작업을 찾을 수 없습니다. 서버가 다시 시작되었다면 '번역 시작'을 다시 눌러 이어서 번역하세요.")
+        forget_job()
+    elif job.finished:
+        show_finished_job(job)
+    else:
+        job_running = True
+        try:
+            job_terms = get_glossary_terms(load_glossary(glossary_path))
+        except Exception:
+            job_terms = ([], [])
+        job_progress_view(job.id, *job_terms)
+
+# 마지막 번역 실행의 성능 지표
+if st.session_state.get("last_metrics") and not job_running:
+    display_metrics_summary(st.session_state.last_metrics)
+
+# 번역 작업이 진행 중이면 끝난 뒤 결과 파일을 불러와 표시합니다.
+if st.session_state.mtpe_exist and not job_running:
     load_and_display_existing_translation(source_path, mtpe_path, glossary_path, "기계번역 사후교정 결과", mtpe_path)
 
-elif st.session_state.mt_exist:
-    load_and_display_existing_translation(source_path, mt_path, glossary_path, "기계번역 결과", mtpe_path) 
\ No newline at end of file
+elif st.session_state.mt_exist and not job_running:
+    load_and_display_existing_translation(source_path, mt_path, glossary_path, "기계번역 결과", mtpe_path)